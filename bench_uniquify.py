@@ -0,0 +1,246 @@
+"""
+Benchmark uniquify functions on synthetic corpora
+
+Run ``python bench_uniquify.py --help`` for options.  Each case is
+run in a fresh process so that its peak memory can be measured.
+Results are printed as a table and optionally written as JSON lines
+(``--output``), which can be compared with another run (``--compare``).
+
+"""
+
+import gc
+import json
+import random
+import resource
+import time
+from multiprocessing import Process, Queue
+
+import uniquify
+
+
+# Corpus generators.  Each takes a seeded ``random.Random``, the number
+# of names and their depth (number of components) and returns a list
+# of names.
+
+def gen_tree(rnd, num, depth):
+    """
+    Paths in a deep filesystem tree
+
+    >>> gen_tree(random.Random(0), 2, 3) == gen_tree(random.Random(0), 2, 3)
+    True
+    >>> gen_tree(random.Random(0), 1, 3)[0].split('/')[4:-1]
+    ['d8', 'd7']
+
+    """
+    prefix = ['', 'home', 'user', 'project']
+    return ['/'.join(prefix +
+                     ['d{0}'.format(rnd.randrange(10))
+                      for _ in range(depth - 1)] +
+                     ['file_{0}.txt'.format(rnd.randrange(10))])
+            for _ in range(num)]
+
+
+def gen_artifacts(rnd, num, depth):
+    """
+    Build artifact paths like ``build/<config>/<arch>/obj/<module>/x.o``
+    """
+    configs = ['debug', 'release', 'relwithdebinfo']
+    archs = ['x86_64', 'aarch64', 'armv7']
+    names = []
+    for _ in range(num):
+        modules = ['mod{0}'.format(rnd.randrange(20))
+                   for _ in range(max(depth - 4, 1))]
+        names.append('/'.join(
+            ['build', rnd.choice(configs), rnd.choice(archs), 'obj'] +
+            modules + ['unit{0}.o'.format(rnd.randrange(100))]))
+    return names
+
+
+def gen_hosts(rnd, num, depth):
+    """
+    Host names with shared domain suffixes
+    """
+    regions = ['us-east-1', 'us-west-2', 'eu-central-1', 'ap-northeast-1']
+    roles = ['web', 'db', 'cache', 'worker', 'batch']
+    names = []
+    for _ in range(num):
+        host = '{0}-{1}'.format(rnd.choice(roles), rnd.randrange(99))
+        zones = ['z{0}'.format(rnd.randrange(4))
+                 for _ in range(max(depth - 4, 0))]
+        names.append('.'.join([host] + zones + [rnd.choice(regions),
+                                                'prod', 'example', 'com']))
+    return names
+
+
+def gen_multisep(rnd, num, depth):
+    """
+    Names to be split by the nested separators ``('/', '_')``
+    """
+    return ['/'.join(['runs'] +
+                     ['_'.join(['exp', str(rnd.randrange(5)),
+                                'seed', str(rnd.randrange(3))])
+                      for _ in range(depth - 2)] +
+                     ['out.log'])
+            for _ in range(num)]
+
+
+CORPORA = {
+    'tree': (gen_tree, '/'),
+    'artifacts': (gen_artifacts, '/'),
+    'hosts': (gen_hosts, '.'),
+    'multisep': (gen_multisep, ('/', '_')),
+}
+
+
+def _skipcommon(names, sep):
+    if not isinstance(sep, tuple):
+        sep = (sep,)
+    return uniquify.SeqList.skipcommon(names, sep, '...')
+
+
+FUNCTIONS = {
+    'shortname': lambda names, sep: uniquify.shortname(names, sep),
+    'shortpath': lambda names, sep: uniquify.shortpath(names),
+    'skipcommonname': lambda names, sep: uniquify.skipcommonname(names, sep),
+    'skipcommonpath': lambda names, sep: uniquify.skipcommonpath(names),
+    'SeqList.skipcommon': _skipcommon,
+}
+
+
+def _proc_status(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+
+
+def reset_peak():
+    """
+    Reset the peak memory and return the current memory in KiB
+
+    On Linux, the peak resident set size can be reset by writing to
+    /proc/self/clear_refs.  Elsewhere, the peak so far is returned and
+    the measured peak is an increase from that.
+
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return _proc_status('VmRSS')
+    except (IOError, OSError):
+        return peak()
+
+
+def peak():
+    """Peak resident set size of this process in KiB"""
+    try:
+        return _proc_status('VmHWM')
+    except (IOError, OSError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_case(func, corpus, num, depth, seed, repeat):
+    """Run one case in this process and return a dict of the result"""
+    (gen, sep) = CORPORA[corpus]
+    names = gen(random.Random(seed), num, depth)
+    first = sep[0] if isinstance(sep, tuple) else sep
+    tokens = sum(len(n) if first is None else n.count(first) + 1
+                 for n in names)
+    gc.collect()
+    rss0 = reset_peak()
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        FUNCTIONS[func](names, sep)
+        times.append(time.time() - start)
+    return dict(func=func, corpus=corpus, num=num, depth=depth,
+                seed=seed, tokens=tokens,
+                time=min(times), peak_kib=peak() - rss0)
+
+
+def _run_case_child(queue, args):
+    queue.put(run_case(*args))
+
+
+def run_case_isolated(*args):
+    """Run :func:`run_case` in a new process to measure its peak memory"""
+    queue = Queue()
+    proc = Process(target=_run_case_child, args=(queue, args))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def key(result):
+    return (result['func'], result['corpus'], result['num'], result['depth'])
+
+
+def load(path):
+    with open(path) as f:
+        return dict((key(r), r) for r in map(json.loads, f) if r)
+
+
+def print_result(result, old=None):
+    line = '{func:18} {corpus:9} {num:>8} {depth:>5} {tokens:>9} ' \
+        '{time:10.4f} {peak_kib:>9}'.format(**result)
+    if old is not None:
+        line += ' {0:7.2f}x'.format(result['time'] / max(old['time'], 1e-9))
+    print(line)
+
+
+def main():
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '-f', '--func', action='append', choices=sorted(FUNCTIONS),
+        help='function to benchmark (default: all)')
+    parser.add_argument(
+        '-c', '--corpus', action='append', choices=sorted(CORPORA),
+        help='corpus to use (default: all)')
+    parser.add_argument(
+        '-n', '--num', default='100,1000,10000',
+        help='comma separated numbers of names (default: %(default)s)')
+    parser.add_argument(
+        '-d', '--depth', default='4,8,16',
+        help='comma separated depths of names (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3,
+        help='number of runs; the fastest is reported (default: %(default)s)')
+    parser.add_argument(
+        '-o', '--output',
+        help='file to write the results as JSON lines')
+    parser.add_argument(
+        '--compare',
+        help='results of a previous run (JSON lines) to compare with')
+    args = parser.parse_args()
+
+    old = load(args.compare) if args.compare else {}
+    funcs = args.func or sorted(FUNCTIONS)
+    corpora = args.corpus or sorted(CORPORA)
+    nums = [int(x) for x in args.num.split(',')]
+    depths = [int(x) for x in args.depth.split(',')]
+
+    output = open(args.output, 'w') if args.output else None
+    print('{0:18} {1:9} {2:>8} {3:>5} {4:>9} {5:>10} {6:>9}'.format(
+        'func', 'corpus', 'num', 'depth', 'tokens', 'time [s]', 'peak[KiB]'))
+    try:
+        for func in funcs:
+            for corpus in corpora:
+                for depth in depths:
+                    for num in nums:
+                        result = run_case_isolated(
+                            func, corpus, num, depth, args.seed, args.repeat)
+                        print_result(result, old.get(key(result)))
+                        if output:
+                            output.write(json.dumps(result, sort_keys=True))
+                            output.write('\n')
+                            output.flush()
+    finally:
+        if output:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
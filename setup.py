@@ -3,7 +3,7 @@ import uniquify
 
 setup(
     name='uniquify',
-    py_modules=['uniquify'],
+    py_modules=['uniquify', 'uniquify_client'],
     description='Uniquify - '
     'get unique, short and easy-to-read names and paths',
     version=uniquify.__version__,
@@ -1,5 +1,6 @@
 import uniquify
-from nose.tools import eq_
+from nose.tools import eq_, assert_raises
+from nose.plugins.skip import SkipTest
 
 
 class CheckData(object):
@@ -28,6 +29,10 @@ class TestShortName(CheckData):
             ['_____abc___def',
              '_____xyz___uvw'],
             utype='head'),
+        rak(['f', 'w', 'f'],
+            ['_____abc___def',
+             '_____xyz___uvw',
+             '_____abc___def']),
         rak(['c...def', 'z...def', 'z...uvw'],
             ['_____abc___def',
              '_____xyz___def',
@@ -47,6 +52,53 @@ class TestShortName(CheckData):
         eq_(result, uniquify.shortname(*args, **kwds))
 
 
+class TestShortNameEngine(CheckData):
+
+    data = [
+        (['_____abc___def',
+          '_____xyz___def',
+          '_____xyz___uvw'], {}),
+        (['_____abc___def',
+          '_____xyz___def',
+          '_____x'], dict(minlen=2)),
+        (['a/b/c', 'a/b/c', 'x/b/c', 'a/y/c'], dict(sep='/')),
+        (['a/b/c', 'a/b/c', 'x/b/c', 'a/y/c'], dict(sep='/', utype='head')),
+        (['a/.../c', 'a/./../c'], dict(sep='/', skip='')),
+        (['aa|c|d_e', 'ab|c|d_d', 'ab|c|d_e'],
+         dict(sep=('|', '_'), skip='*')),
+        ]
+
+    def check(self, names, kwds):
+        desired = uniquify.shortname(names, engine='scan', **kwds)
+        eq_(desired, uniquify.shortname(names, engine='trie', **kwds))
+        eq_(desired, uniquify.shortname(names, engine='scan', compact=True,
+                                        **kwds))
+        eq_(desired, uniquify.shortname(names, engine='trie', compact=True,
+                                        **kwds))
+
+
+class TestShortNameAdaptive(CheckData):
+
+    data = [
+        (['src/a/main.c', 'src/b/main.c', 'src/b/util.c', 'doc/index.txt'],
+         dict(sep='/'),
+         ['a/main.c', 'b/main.c', 'util.c', 'index.txt']),
+        (['src/a/main.c', 'src/b/main.c', 'src/b/util.c', 'doc/index.txt'],
+         dict(sep='/', utype='head'),
+         ['src/a', 'src/b/main.c', 'src/b/util.c', 'doc']),
+        (['a/b', 'x/a/b', 'a/b'], dict(sep='/'), ['a', 'x/a', 'a']),
+        (['aa|c|d_e', 'ab|c|d_d', 'ab|c|d_e'], dict(sep=('|', '_')),
+         ['aa|c|d_e', 'd', 'ab|c|d_e']),
+        (['abc', 'abd', 'xbd'], dict(minlen=2), ['bc', 'abd', 'xbd']),
+        (['one'], dict(sep='/'), ['...']),
+        ]
+
+    def check(self, names, kwds, desired):
+        shorts = uniquify.shortname(names, adaptive=True, **kwds)
+        eq_(shorts, desired)
+        eq_(len(set(shorts)), len(set(names)))
+
+
 class TestShortPath(CheckData):
 
     data = [
@@ -78,6 +130,8 @@ class TestSkipCommonName(CheckData):
             ['aac', 'abc']),
         rak(['aa...c', 'ab...b', 'ab...c'],
             ['aaxxxxc', 'abxxxxb', 'abxxxxc']),
+        rak(['aa...c', 'ab...b', 'aa...c'],
+            ['aaxxxxc', 'abxxxxb', 'aaxxxxc']),
         rak(['aa|...|de', 'ab|...|dd', 'ab|...|de'],
             ['aa|c|c|de', 'ab|c|c|dd', 'ab|c|c|de'], sep='|'),
         rak(['aa|c|de', 'ab|c|dd', 'ab|c|de'],
@@ -112,6 +166,468 @@ class TestSkipCommonPath(CheckData):
         eq_(result, uniquify.skipcommonpath(*args, **kwds))
 
 
+class TestUniquifier(CheckData):
+
+    data = [
+        (['+a/b/c', '+a/x/c', '+a/y/c', '-a/y/c', '-a/x/c'], '/', '*'),
+        (['+a/b/c', '+a/b/c', '+a/x/c', '-a/b/c', '-a/x/c'], '/', '*'),
+        (['+aa|c|d_e', '+ab|c|d_d', '+ab|c|d_e', '-aa|c|d_e', '+ab|x|d_e'],
+         ('|', '_'), '*'),
+        (['+aaxxxxc', '+abxxxxb', '+abxxxxc', '-abxxxxb'], None, '...'),
+        ]
+
+    def check(self, ops, sep, skip):
+        uq = uniquify.Uniquifier(sep=sep, skip=skip)
+        names = []
+        shorts = {}
+        for op in ops:
+            name = op[1:]
+            if op[0] == '+':
+                names.append(name)
+                shorts.update(uq.add(name))
+            else:
+                names.remove(name)
+                shorts.update(uq.remove(name))
+            desired = uniquify.skipcommonname(names, sep, skip)
+            eq_(dict(zip(names, desired)), dict((n, shorts[n]) for n in names))
+            eq_(sorted(names), sorted(uq.names()))
+
+
+class TestNumpyBackend(CheckData):
+
+    data = [
+        ([[1, 2, 3], [1, 2, 2], [1, 1, 2]], None),
+        ([[1, 2, 3], [1, 2]], None),
+        ([['a', 'b'], ['a', 'b', 'c', 'd'], ['a', 'x', 'c', 'd']], None),
+        ([list('aaxxxxc'), list('abxxxxb')], ['aaxxxxc', 'abxxxxb']),
+        ([list(u'a\xe9c'), list(u'a\xe9d')], [u'a\xe9c', u'a\xe9d']),
+        ([list('ab'), list('ab\0')], ['ab', 'ab\0']),
+        ]
+
+    def check(self, lol, names):
+        if uniquify._numpy() is None:
+            raise SkipTest
+        diffs = uniquify._diff_array(lol, names)
+        eq_(uniquify._diff_list(lol), diffs.tolist())
+        eq_(uniquify._chunks_from_diffs(uniquify._diff_list(lol)),
+            uniquify._chunks_from_diffs_numpy(diffs))
+
+
+class TestArrayFilled(CheckData):
+
+    names = ['some/long/path/{0}/middle/{1}/DEF'.format(i % 7, i % 5)
+             for i in range(80)] + ['some/x', 'some/long/y']
+    data = [
+        (utype, engine, compact)
+        for utype in ['head', 'tail']
+        for engine in ['trie', 'scan']
+        for compact in [False, True]]
+
+    def check(self, utype, engine, compact):
+        kwds = dict(utype=utype, engine=engine, compact=compact)
+        numpy = uniquify._numpy()
+        if numpy is None:
+            raise SkipTest
+        try:
+            uniquify.numpy = None
+            desired = uniquify.shortpath(self.names, **kwds)
+        finally:
+            uniquify.numpy = numpy
+        eq_(uniquify.shortpath(self.names, **kwds), desired)
+
+
+class TestContainer(CheckData):
+
+    names = ['some/long/path/ABC/middle/part/DEF',
+             'some/long/path/XYZ/middle/part/DEF',
+             'some/long/path/XYZ/middle/part/UVW']
+    data = [
+        (method, container)
+        for method in ['shortname', 'shortpath',
+                       'skipcommonname', 'skipcommonpath']
+        for container in ['bytes', 'unicode', 'object', 'series']]
+
+    def check(self, method, container):
+        try:
+            import numpy
+            import pandas
+        except ImportError:
+            raise SkipTest
+        func = getattr(uniquify, method)
+        args = () if method.endswith('path') else ('/',)
+        desired = func(self.names, *args)
+        if container == 'series':
+            names = pandas.Series(self.names, index=[5, 6, 7], name='n')
+            result = func(names, *args)
+            assert isinstance(result, pandas.Series)
+            eq_(list(result.index), [5, 6, 7])
+            eq_(result.name, 'n')
+        else:
+            dtype = dict(bytes='S', unicode='U', object=object)[container]
+            names = numpy.array(self.names, dtype=dtype)
+            result = func(names, *args)
+            assert isinstance(result, numpy.ndarray)
+            eq_(result.dtype.kind, numpy.dtype(dtype).kind)
+        eq_(result.tolist(), desired)
+        assert_raises(ValueError, func, names, *args, lazy=True)
+
+
+class TestIndex(CheckData):
+
+    names = ['some/long/path/ABC/middle/part/DEF',
+             'some/long/path/XYZ/middle/part/DEF',
+             'some/long/path/XYZ/middle/part/UVW',
+             'some/long/path/ABC/middle/part/DEF']
+    data = [
+        ('shortpath', {}),
+        ('shortpath', dict(utype='head', adaptive=True)),
+        ('shortname', dict(sep='/', minlen=5)),
+        ('skipcommonpath', dict(skip='*')),
+        ('skipcommonname', {}),
+        ]
+
+    def check(self, method, kwds):
+        import os
+        import tempfile
+        desired = getattr(uniquify, method)(self.names, **kwds)
+        index = uniquify.Index(self.names, method, **kwds)
+        eq_([index.short(n) for n in self.names], desired)
+        (fd, path) = tempfile.mkstemp()
+        try:
+            index.save(path)
+            loaded = uniquify.Index.load(path)
+        finally:
+            os.close(fd)
+            os.remove(path)
+        eq_([loaded.short(n) for n in self.names], desired)
+        eq_(len(loaded), 3)
+        assert_raises(KeyError, loaded.short, 'some/other/path')
+
+    def test_nul(self):
+        import os
+        index = uniquify.Index(['a\0b/x', 'a\0b/y'])
+        assert_raises(ValueError, index.save, os.devnull)
+
+
+class TestIterSkipCommon(CheckData):
+
+    data = [
+        ([], None, '...'),
+        (['one'], None, '...'),
+        (['aaxxxxc', 'abxxxxb', 'aaxxxxc', 'abxxxxc'], None, '...'),
+        (['aa|c|c|de', 'ab|c|c|dd', 'ab|c|c|de', 'ab|c'], '|', '...'),
+        (['aa|c|d_e', 'ab|c|d_d', 'ab|c|d_e'], ('|', '_'), '*'),
+        (['a/b/z', 'a/c/d/z', 'a/c/d/z'], '/', '*'),
+        (['r/a_1_x/f', 'r/b_1_x/f', 'r/b/f', 'r/_'], ('/', '_'), '_'),
+        ]
+
+    def check(self, names, sep, skip):
+        import os
+        import tempfile
+        desired = uniquify.skipcommonname(names, sep, skip)
+        eq_(list(uniquify.iskipcommonname(names, sep, skip)), desired)
+        eq_(list(uniquify.iskipcommonname(lambda: iter(names), sep, skip)),
+            desired)
+        (fd, path) = tempfile.mkstemp()
+        try:
+            os.write(fd, ''.join(n + '\n' for n in names))
+            eq_(list(uniquify.iskipcommonname(path, sep, skip)), desired)
+        finally:
+            os.close(fd)
+            os.remove(path)
+
+    def test_iterator(self):
+        assert_raises(TypeError, uniquify.iskipcommonname, iter(['a']))
+
+
+class TestWorkers(CheckData):
+
+    names = ['some/long/path/{0}/middle/{1}/DEF_{2}'.format(i % 7, i % 5, i)
+             for i in range(40)] + ['some/x', 'some/long/y', 'some/x']
+    data = [
+        ('skipcommonpath', {}),
+        ('skipcommonname', dict(sep=('/', '_'), skip='*')),
+        ('shortpath', {}),
+        ('shortname', dict(sep='/', utype='head', adaptive=True)),
+        ]
+
+    def check(self, method, kwds):
+        func = getattr(uniquify, method)
+        desired = func(self.names, **kwds)
+        minnames = uniquify._SHARD_MIN_NAMES
+        uniquify._SHARD_MIN_NAMES = 10
+        try:
+            eq_(func(self.names, workers=3, **kwds), desired)
+        finally:
+            uniquify._SHARD_MIN_NAMES = minnames
+
+
+class TestLazy(CheckData):
+
+    names = ['some/long/path/ABC/middle/part/DEF',
+             'some/long/path/XYZ/middle/part/DEF',
+             'some/long/path/XYZ/middle/part/UVW',
+             'some/long/path/ABC/middle/part/DEF']
+    data = [
+        ('skipcommonpath', True, {}),
+        ('skipcommonname', 2, dict(sep=('/', '_'), skip='*')),
+        ('shortpath', True, {}),
+        ('shortpath', 1, dict(utype='head', compact=True)),
+        ('shortname', 8, dict(sep='/', adaptive=True)),
+        ('shortname', True, dict(minlen=50)),
+        ]
+
+    def check(self, method, lazy, kwds):
+        func = getattr(uniquify, method)
+        desired = func(self.names, **kwds)
+        view = func(self.names, lazy=lazy, **kwds)
+        assert isinstance(view, uniquify.LazyNames)
+        eq_(len(view), len(desired))
+        eq_([view[i] for i in [3, 0, -1, 0]],
+            [desired[i] for i in [3, 0, -1, 0]])
+        eq_(view[1:], desired[1:])
+        eq_(list(view), desired)
+        assert_raises(IndexError, lambda: view[len(desired)])
+        sep = '/' if method.endswith('path') else None
+        analysis = uniquify.Analysis(self.names, kwds.get('sep', sep),
+                                     kwds.get('skip', '...'))
+        kwds = dict((k, v) for (k, v) in kwds.items()
+                    if k not in ('sep', 'skip'))
+        eq_(list(func(analysis, lazy=lazy, **kwds)), desired)
+
+
+class TestBatch(CheckData):
+
+    groups = [
+        ['some/long/path/ABC/middle/part/DEF',
+         'some/long/path/XYZ/middle/part/DEF',
+         'some/long/path/XYZ/middle/part/UVW'],
+        ['one'],
+        [],
+        ['a/a/c', 'a/b/c'],
+        ]
+    data = [
+        ('skipcommonpath', 1, 1000, {}),
+        ('skipcommonpath', 2, 1, {}),
+        ('shortpath', 2, 3, {}),
+        ('shortname', 2, 2, dict(sep='/', utype='head')),
+        ]
+
+    def check(self, method, workers, chunksize, kwds):
+        func = getattr(uniquify, method)
+        eq_([func(g, **kwds) for g in self.groups],
+            uniquify.batch(self.groups, method, workers, chunksize, **kwds))
+
+
+class TestAnalysis(CheckData):
+
+    data = [
+        (['aa|c|d_e', 'ab|c|d_d', 'ab|c|d_e', 'aa|c|d_e'], ('|', '_')),
+        (['__abc__', '__xyz__', '__x__'], None),
+        (['some/long/path/ABC/middle/part/DEF',
+          'some/long/path/XYZ/middle/part/DEF',
+          'some/long/path/XYZ/middle/part/DEF',
+          'some/long/path/XYZ/middle/part/UVW'], '/'),
+        ]
+
+    def check(self, names, sep):
+        analysis = uniquify.Analysis(names, sep, '*')
+        eq_(uniquify.skipcommonname(analysis),
+            uniquify.skipcommonname(names, sep, '*'))
+        for utype in ['head', 'tail']:
+            eq_(uniquify.shortname(analysis, utype=utype),
+                uniquify.shortname(names, sep, '*', utype=utype))
+        if sep == '/':
+            eq_(uniquify.shortpath(analysis),
+                uniquify.shortpath(names, '*'))
+            eq_(uniquify.skipcommonpath(analysis),
+                uniquify.skipcommonpath(names, '*'))
+        else:
+            assert_raises(ValueError, uniquify.skipcommonpath, analysis)
+
+
+class TestBufferInput(CheckData):
+
+    names = ['some/long/path/ABC/middle/part/DEF',
+             'some/long/path/XYZ/\xff\xfe/part/DEF',
+             'some/long/path/XYZ/middle/part/DEF']
+    data = [
+        (method, buftype)
+        for method in ['shortname', 'shortpath',
+                       'skipcommonname', 'skipcommonpath']
+        for buftype in uniquify._BUFFER_TYPES]
+
+    def check(self, method, buftype):
+        func = getattr(uniquify, method)
+        args = () if method.endswith('path') else ('/',)
+        eq_(func(self.names, *args),
+            func([buftype(n) for n in self.names], *args))
+
+
+class TestWalk(CheckData):
+
+    files = ['a/x/src/main.c', 'a/x/src/util.c', 'b/x/src/main.c',
+             'b/y/main.c', 'b/y/z/w/main.c', 'README']
+    data = [
+        ('skipcommonpath', None, {}),
+        ('skipcommonpath', 3, dict(skip='*')),
+        ('shortpath', None, {}),
+        ('shortpath', 2, dict(utype='head', minlen=3)),
+        ('shortpath', None, dict(adaptive=True)),
+        ]
+
+    @classmethod
+    def setup_class(cls):
+        import os
+        import tempfile
+        cls.root = tempfile.mkdtemp()
+        for path in cls.files:
+            path = os.path.join(cls.root, path)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            open(path, 'w').close()
+
+    @classmethod
+    def teardown_class(cls):
+        import shutil
+        shutil.rmtree(cls.root)
+
+    def check(self, method, workers, kwds):
+        pairs = list(uniquify.walk(self.root, method, workers, **kwds))
+        paths = [p for (p, _) in pairs]
+        eq_(sorted(p[len(self.root) + 1:] for p in paths), sorted(self.files))
+        eq_([s for (_, s) in pairs], getattr(uniquify, method)(paths, **kwds))
+
+    def test_bad_arguments(self):
+        assert_raises(ValueError, uniquify.walk, self.root, 'bogus')
+        assert_raises(ValueError, uniquify.walk, self.root, 'shortpath',
+                      utype='middle')
+        assert_raises(ValueError, uniquify.walk, self.root, 'shortpath',
+                      engine='bogus')
+        assert_raises(TypeError, uniquify.walk, self.root, sep='/')
+
+
+class TestServe(CheckData):
+
+    names = ['some/long/path/ABC/middle/part/DEF',
+             'some/long/path/XYZ/middle/part/DEF',
+             'some/long/path/XYZ/middle/part/UVW']
+    data = [
+        ('skipcommonpath', {}),
+        ('shortpath', dict(utype='head')),
+        ('shortname', dict(sep='/', minlen=2)),
+        ]
+
+    @classmethod
+    def setup_class(cls):
+        import os
+        import tempfile
+        import threading
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.tmpdir, 'socket')
+        thread = threading.Thread(target=uniquify.serve, args=(cls.path,))
+        thread.daemon = True
+        thread.start()
+        while not os.path.exists(cls.path):
+            thread.join(0.01)
+
+    @classmethod
+    def teardown_class(cls):
+        import shutil
+        shutil.rmtree(cls.tmpdir)
+
+    def check(self, method, kwds):
+        func = getattr(uniquify, method)
+        eq_(func(self.names, **kwds),
+            uniquify.request(self.path, method, self.names, **kwds))
+
+    def test_connect_bytes(self):
+        import os
+        import sys
+        import tempfile
+        from StringIO import StringIO
+        import uniquify_client
+        names = ['some/long/\xff/path', 'some/long/b/path']
+        (fd, path) = tempfile.mkstemp()
+        os.write(fd, ''.join(n + '\0' for n in names))
+        os.close(fd)
+        (stdout, sys.stdout) = (sys.stdout, StringIO())
+        try:
+            eq_(uniquify_client.main(['--connect', self.path, '-0', path]),
+                0)
+            result = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+            os.remove(path)
+        eq_(result, ''.join(r + '\0' for r in uniquify.skipcommonpath(names)))
+
+
+class TestMemoize(CheckData):
+
+    data = [
+        ('shortname', ['_____abc___def', '_____xyz___uvw'], {}),
+        ('shortpath', ['a/b/c', 'a/x/c'], dict(utype='head')),
+        ('skipcommonname', ['aaxxxxc', 'abxxxxb', 'abxxxxc'], {}),
+        ('skipcommonpath', ['a/a/c', 'a/b/c'], dict(skip='*')),
+        ]
+
+    def check(self, method, names, kwds):
+        func = getattr(uniquify, method)
+        cached = uniquify.memoize(func, maxsize=1)
+        desired = func(names, **kwds)
+        for _ in range(2):
+            result = cached(iter(names), **kwds)
+            eq_(desired, result)
+            result.append('modified')
+        eq_((1, 1, 1, 1), tuple(cached.cache_info()))
+        cached(names[:1], **kwds)
+        cached(names, **kwds)
+        eq_((1, 3, 1, 1), tuple(cached.cache_info()))
+
+    def test_inputs(self):
+        names = ['some/long/path/ABC/middle/part/DEF',
+                 'some/long/path/XYZ/middle/part/DEF']
+        desired = uniquify.shortpath(names)
+        cached = uniquify.memoize(uniquify.shortpath)
+        eq_(cached(map(bytearray, names)), desired)
+        eq_(cached([memoryview(n) for n in names]), desired)
+        analysis = uniquify.Analysis(names, '/')
+        for _ in range(2):
+            eq_(cached(analysis), desired)
+        view = cached(names, lazy=True)
+        assert isinstance(view, uniquify.LazyNames)
+        assert cached(names, lazy=True) is view
+        eq_(list(view), desired)
+        try:
+            import numpy
+        except ImportError:
+            return
+        for _ in range(2):
+            result = cached(numpy.array(names))
+            assert isinstance(result, numpy.ndarray)
+            eq_(result.tolist(), desired)
+            result[0] = 'modified'
+
+
+class TestFit(CheckData):
+
+    data = [
+        (['runs/2020/exp1/seed-1/out.log', 'runs/2021/exp2/seed-2/out.log'],
+         ['runs/2022/exp9/seed-3/out.log', 'runs/2023/exp9/seed-3/err.log',
+          'runs/2024/exp1/seed-1/err.log/x'], '/'),
+        (['aaxxxxc', 'abxxxxb'], ['acxxxxa', 'acxxxxab', 'acyxxxa'], None),
+        (['a/b/c', 'a/b/d'], ['a/b/e', 'a/b', 'x'], ('/',)),
+        ]
+
+    def check(self, sample, names, sep):
+        tmpl = uniquify.fit(sample, sep)
+        for name in names:
+            # what skipcommonname gives with the names seen so far
+            sample = sample + [name]
+            desired = uniquify.skipcommonname(sample, sep)[-1]
+            eq_(desired, tmpl(name))
+
+
 class TestSeqListSkipCommon(CheckData):
 
     skipmarker = "@@@@@"
@@ -133,6 +649,21 @@ class TestSeqListSkipCommon(CheckData):
         eq_(desired, sl.joinseqs())
 
 
+class TestSkipCommonFlat(CheckData):
+
+    data = [
+        (['aa|c|d_e', 'ab|c|d_d', 'ab|c|d_e'], ('|', '_'), '*'),
+        (['a/b_c-d', 'a/b_c-e', 'x/b_y-d'], ('/', '_', '-'), '...'),
+        (['a/bc', 'a/bd', 'a/b'], ('/', None), '*'),
+        (['a//b', 'a/b', 'a///'], ('/', '//'), ''),
+        (['ab|...|c', 'ab|...|d'], ('|', '.'), '...'),
+        ]
+
+    def check(self, names, seplist, skip):
+        desired = uniquify.SeqList._skipcommon_recursive(names, seplist, skip)
+        eq_(list(desired), uniquify._skipcommon_flat(names, seplist, skip))
+
+
 def makename(namesource, seplist):
     """
     Make a list of string joined using `sep`-s in `seplist`
@@ -168,6 +699,26 @@ def deeplyreplaced(lst, old, new):
     return newlst
 
 
+class TestSplitChunks(CheckData):
+
+    data = [
+        (['/mnt/a/x/out.h5', '/mnt/b/y/out.h5'], '/'),
+        (['/mnt/a/x/out.h5', '/mnt/b/out.h5'], '/'),
+        (['c/ab/x', 'c/ab'], '/'),
+        (['a//b', 'a/y/b'], '/'),
+        (['a/b', 'a/b/a/b'], '/'),
+        (['x/', 'x//'], '/'),
+        (['abxc', 'abyc', 'abc'], None),
+        (['ab', 'ab'], None),
+        (['a--b--c', 'a--x--c'], '--'),
+        ]
+
+    def check(self, names, sep):
+        (lol, sep_) = uniquify._split_names(names, sep)
+        chunks = uniquify._get_chunks(lol, None if sep else names)
+        eq_(uniquify._split_chunks(names, sep), (lol, sep_, chunks))
+
+
 class TestColViewHomo(CheckData):
 
     data = [
@@ -199,3 +750,35 @@ class TestColViewNonNull(CheckData):
         if indices is not None:
             col.indices = indices
         eq_(result, col.nonnull(k))
+
+
+class TestSeqListCol(CheckData):
+
+    data = [
+        ([[0, 1], [0, 2], [0, 2]],),
+        ([[0, 1, 2], [3], [], [4, 5]],),
+        ([[], []],),
+        ]
+
+    def check(self, los):
+        sl = uniquify.SeqList(los)
+        for i in range(sl.maxseqlen() + 1):
+            col = sl.col(i)
+            view = uniquify.ColView(los, i)
+            eq_(list(col), list(view))
+            eq_(list(col.indices), view.indices)
+            eq_([col[j] for j in col.indices], list(view))
+            for j in set(range(len(los))) - set(view.indices):
+                assert_raises(IndexError, col.__getitem__, j)
+            if view.indices:
+                eq_(col.homo(), view.homo())
+                eq_(col.nonnull(), view.nonnull())
+
+    def test_changed(self):
+        sl = uniquify.SeqList([['a', 'b'], ['a']])
+        assert sl.col(0).homo()
+        sl.extendseq([['c']], [1])
+        eq_(list(sl.col(1)), ['b', 'c'])
+        sl.reverseseq()
+        eq_(list(sl.col(0)), ['b', 'c'])
+        assert not sl.col(0).homo()
@@ -0,0 +1,208 @@
+"""
+Check that the work done by each function grows near-linearly
+
+The work is the number of lines of Python executed, counted by a
+trace function, so that it does not depend on the speed or the load
+of the machine.  The growth exponent is fitted on inputs of
+geometrically growing number of names and depth, in terms of the
+total number of tokens.
+
+Work done inside C code (builtins and NumPy) is not counted as such.
+So the number of names is also grown below uniquify._NUMPY_MIN_ROWS
+and, with NumPy disabled, above it, where the same work is done by
+Python code.  Names are given as :class:`Name`, whose comparisons
+and hashing run Python code, so that C code comparing names (e.g.,
+``name in list`` or ``list.index``) is counted too.
+
+"""
+
+import math
+import random
+import sys
+
+import uniquify
+from test_uniquify import CheckData
+
+
+class Name(str):
+
+    """String whose comparisons and hashing are seen by count_lines"""
+
+    def __eq__(self, other):
+        return str.__eq__(self, other)
+
+    def __ne__(self, other):
+        return str.__ne__(self, other)
+
+    def __lt__(self, other):
+        return str.__lt__(self, other)
+
+    def __le__(self, other):
+        return str.__le__(self, other)
+
+    def __gt__(self, other):
+        return str.__gt__(self, other)
+
+    def __ge__(self, other):
+        return str.__ge__(self, other)
+
+    def __hash__(self):
+        return str.__hash__(self)
+
+
+def make_names(num, depth, seed=0, unique=False):
+    """
+    Paths with ``depth`` components, some shared by all of them
+
+    >>> [name.split('/')[2] for name in make_names(2, 4)]
+    ['common', 'common']
+
+    If ``unique`` is true, the last component of each path is unique,
+    so that the short names are short however deep the paths are.
+
+    >>> [name.split('/')[-1] for name in make_names(2, 4, unique=True)]
+    ['f0.txt', 'f1.txt']
+
+    """
+    rnd = random.Random(seed)
+    names = []
+    for _ in range(num):
+        parts = ['root']
+        for i in range(depth - 2):
+            if i % 3 == 1:
+                parts.append('common')
+            else:
+                parts.append('d{0}'.format(rnd.randrange(10)))
+        parts.append('f{0}.txt'.format(len(names) if unique
+                                       else rnd.randrange(10)))
+        names.append(Name('/'.join(parts)))
+    return names
+
+
+def count_lines(func, *args, **kwds):
+    """Return the number of lines of Python executed by ``func``"""
+    counter = [0]
+
+    def trace(frame, event, arg):
+        if event == 'line':
+            counter[0] += 1
+        return trace
+
+    old = sys.gettrace()
+    sys.settrace(trace)
+    try:
+        func(*args, **kwds)
+    finally:
+        sys.settrace(old)
+    return counter[0]
+
+
+def growth_exponent(sizes, counts):
+    """
+    Slope of the least-squares line through ``log(counts)`` vs ``log(sizes)``
+
+    >>> round(growth_exponent([1, 2, 4], [3, 12, 48]), 6)
+    2.0
+
+    """
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(c) for c in counts]
+    xm = sum(xs) / len(xs)
+    ym = sum(ys) / len(ys)
+    return (sum((x - xm) * (y - ym) for (x, y) in zip(xs, ys)) /
+            sum((x - xm) ** 2 for x in xs))
+
+
+def _diff_list(names):
+    return uniquify._diff_list([n.split('/') for n in names])
+
+
+def _seqlist_skipcommon(names):
+    return uniquify.SeqList.skipcommon(names, ['/'], '...')
+
+
+def _uniquifier(names):
+    return uniquify.Uniquifier(names, sep='/')
+
+
+FUNCTIONS = {
+    'shortname': lambda names: uniquify.shortname(names, '/'),
+    'shortname(adaptive)':
+    lambda names: uniquify.shortname(names, '/', adaptive=True),
+    'shortname(scan)': lambda names: uniquify.shortname(names, '/',
+                                                        engine='scan'),
+    'shortpath': uniquify.shortpath,
+    'skipcommonname': lambda names: uniquify.skipcommonname(names, '/'),
+    'skipcommonpath': uniquify.skipcommonpath,
+    '_diff_list': _diff_list,
+    'SeqList.skipcommon': _seqlist_skipcommon,
+    'Uniquifier': _uniquifier,
+}
+
+# (number of names, depth, unique) of the inputs for each axis.
+# Numbers of names start at uniquify._NUMPY_MIN_ROWS, or stop below it,
+# so that all inputs of an axis take the same code path.
+SHAPES = {
+    'num': [(64, 8, False), (128, 8, False), (256, 8, False),
+            (512, 8, False)],
+    'num-small': [(8, 8, False), (16, 8, False), (32, 8, False),
+                  (63, 8, False)],
+    'depth': [(64, 4, False), (64, 8, False), (64, 16, False),
+              (64, 32, False)],
+    'depth-unique': [(64, 16, True), (64, 32, True), (64, 64, True),
+                     (64, 128, True)],
+}
+
+
+class TestScaling(CheckData):
+
+    # Budget of the growth exponent in terms of the number of tokens
+    data = [(func, axis, usenumpy, 1.2)
+            for func in sorted(FUNCTIONS)
+            for (axis, usenumpy) in [('num', True), ('num', False),
+                                     ('num-small', True), ('depth', True),
+                                     ('depth-unique', True)]]
+
+    def check(self, func, axis, usenumpy, budget):
+        shapes = SHAPES[axis]
+        sizes = [num * depth for (num, depth, _) in shapes]
+        numpy = uniquify.numpy
+        if not usenumpy:
+            uniquify.numpy = None
+        try:
+            counts = [count_lines(FUNCTIONS[func],
+                                  make_names(num, depth, unique=unique))
+                      for (num, depth, unique) in shapes]
+        finally:
+            uniquify.numpy = numpy
+        exponent = growth_exponent(sizes, counts)
+        assert exponent <= budget, (
+            '{0} grows as (tokens)^{1:.2f} along {2} (budget: {3}{4}); '
+            'lines executed: {5}'.format(
+                func, exponent, axis, budget,
+                '' if usenumpy else ', without NumPy', counts))
+
+
+class TestWindowScaling(CheckData):
+
+    """
+    The window search alone does not grow with the depth of the paths
+    when their short names are short (it is O(N*w), not O(N*L))
+    """
+
+    data = [(engine, 0.2) for engine in ['trie', 'scan']]
+
+    def check(self, engine, budget):
+        shapes = SHAPES['depth-unique']
+        sizes = [num * depth for (num, depth, _) in shapes]
+        counts = []
+        for (num, depth, unique) in shapes:
+            names = make_names(num, depth, unique=unique)
+            sl = uniquify.SeqList.skipcommon(names, ['/'], '...')
+            counts.append(count_lines(uniquify._shortname_seqlist, sl,
+                                      names, 'tail', 1, engine, False))
+        exponent = growth_exponent(sizes, counts)
+        assert exponent <= budget, (
+            'window search ({0}) grows as (tokens)^{1:.2f} along depth '
+            '(budget: {2}); lines executed: {3}'.format(
+                engine, exponent, budget, counts))
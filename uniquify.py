@@ -54,11 +54,106 @@ Install it from pypi_
 __author__ = "Takafumi Arakaki"
 __version__ = '0.0.1'
 __license__ = "MIT License"
-__all__ = ["shortname", "shortpath", "shortpath", "shortname"]
+__all__ = ["shortname", "shortpath", "shortpath", "shortname",
+           "Uniquifier", "batch", "profile", "memoize", "fit",
+           "serve", "request", "walk", "Analysis", "Index",
+           "iskipcommonname", "iskipcommonpath", "LazyNames"]
 
 
+import sys
+
+if __name__ == '__main__' and any(
+        arg == '--connect' or arg.startswith('--connect=')
+        for arg in sys.argv[1:]):
+    # Thin client: do not import what is needed to compute here.
+    import uniquify_client
+    sys.exit(uniquify_client.main())
+
 import os
+import stat
+import json
+import signal
+import zlib
+import mmap
+import time
+import bisect
 import functools
+import itertools
+import contextlib
+import collections
+from array import array
+
+from uniquify_client import request, main as _connect
+
+_NOT_IMPORTED = object()
+numpy = _NOT_IMPORTED
+"""NumPy once imported by :func:`_numpy`; None if it is not available"""
+
+scandir = getattr(os, 'scandir', None)
+if scandir is None:
+    try:
+        from scandir import scandir
+    except ImportError:
+        pass
+
+try:
+    _BUFFER_TYPES = (bytearray, memoryview)
+except NameError:
+    # Python 2.6
+    _BUFFER_TYPES = (bytearray,)
+
+
+def _same_container(func):
+    """
+    Accept a NumPy array or pandas Series of names and return the
+    result in the same kind of container
+
+    NumPy string arrays give string arrays (of the width the result
+    needs) and other arrays give object arrays.  A Series keeps its
+    index and name.  As filling a container would build every name,
+    asking for :class:`LazyNames` of them is a ValueError.
+
+    """
+    def call(names, args, kwds):
+        result = func(names.tolist(), *args, **kwds)
+        if isinstance(result, LazyNames):
+            raise ValueError(
+                "lazy names of a {0} are not supported; pass a list"
+                .format(type(names).__name__))
+        return result
+
+    @functools.wraps(func)
+    def new_func(names, *args, **kwds):
+        pandas = sys.modules.get('pandas')
+        if pandas is not None and isinstance(names, pandas.Series):
+            return pandas.Series(call(names, args, kwds),
+                                 index=names.index, name=names.name,
+                                 dtype=object)
+        np = sys.modules.get('numpy')
+        if np is not None and isinstance(names, np.ndarray):
+            kind = names.dtype.kind
+            return np.array(call(names, args, kwds),
+                               dtype=kind if kind in 'SU' else object)
+        return func(names, *args, **kwds)
+    return new_func
+
+
+def _numpy():
+    """
+    Return NumPy, importing it the first time, or None if it is missing
+
+    NumPy is only needed for long lists (see :data:`_NUMPY_MIN_ROWS`),
+    so short runs do not pay for importing it.
+
+    """
+    global numpy
+    if numpy is _NOT_IMPORTED:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+    return numpy
 
 
 def _pass_empty_list(func):
@@ -70,8 +165,181 @@ def _pass_empty_list(func):
     return new_func
 
 
+def _unique_names(func):
+    """
+    Call ``func`` only with the distinct names and expand its result
+
+    This is valid because the result for each name does not depend on
+    how many times the names appear.
+
+    """
+    @functools.wraps(func)
+    def new_func(names, *args, **kwds):
+        if isinstance(names, Analysis):
+            # already deduplicated
+            return names.expand(func(names, *args, **kwds))
+        (uniq, inverse) = _dedupe(names)
+        result = func(uniq, *args, **kwds)
+        if len(uniq) == len(inverse):
+            return result
+        if isinstance(result, LazyNames):
+            return result.reindex(inverse)
+        return [result[i] for i in inverse]
+    return new_func
+
+
+def _dedupe(names):
+    """
+    Return distinct ``names`` and the index of each name in them
+
+    >>> _dedupe(['a', 'b', 'a', 'c', 'b'])
+    (['a', 'b', 'c'], [0, 1, 0, 2, 1])
+
+    """
+    index = {}
+    uniq = []
+    inverse = []
+    for name in names:
+        if isinstance(name, _BUFFER_TYPES):
+            name = _as_bytes(name)
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(uniq)
+            uniq.append(name)
+        inverse.append(i)
+    return (uniq, inverse)
+
+
+_stats = None
+
+
+class Stats(object):
+
+    """
+    Statistics of each phase collected in :func:`profile`
+
+    Each of ``time``, ``calls``, ``tokens`` and ``columns`` is a dict
+    which maps phase name to the total of wall time in seconds, number
+    of calls, number of tokens and number of columns handled.  Phases
+    are:
+
+    ``'split_names'``
+        :func:`_split_names`
+    ``'get_chunks'``
+        :func:`_get_chunks`
+    ``'skipcommon'``
+        :meth:`SeqList.skipcommon`.  Time of recursive calls is
+        included in the outermost call.
+    ``'window_search'``
+        Search of the window in :func:`shortname`.
+
+    ``maxdepth`` is the maximum recursion depth of these functions,
+    i.e., of :meth:`SeqList.skipcommon`.
+
+    """
+
+    def __init__(self):
+        self.time = {}
+        self.calls = {}
+        self.tokens = {}
+        self.columns = {}
+        self.maxdepth = 0
+        self._depth = {}
+
+    def add(self, phase, elapsed, tokens=0, columns=0):
+        self.time[phase] = self.time.get(phase, 0) + elapsed
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.tokens[phase] = self.tokens.get(phase, 0) + tokens
+        self.columns[phase] = self.columns.get(phase, 0) + columns
+
+    def report(self):
+        """Return the statistics as a table"""
+        lines = ['{0:15} {1:>7} {2:>10} {3:>10} {4:>8}'.format(
+            'phase', 'calls', 'time [s]', 'tokens', 'columns')]
+        for phase in sorted(self.calls, key=self.time.get, reverse=True):
+            lines.append('{0:15} {1:>7} {2:>10.6f} {3:>10} {4:>8}'.format(
+                phase, self.calls[phase], self.time[phase],
+                self.tokens[phase], self.columns[phase]))
+        lines.append('max recursion depth: {0}'.format(self.maxdepth))
+        return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def profile():
+    """
+    Collect :class:`Stats` of the calls made in the ``with`` block
+
+    >>> with profile() as stats:
+    ...     _ = skipcommonname(['aa|c|d_e', 'ab|c|d_d'], sep=('|', '_'))
+    >>> stats.calls['split_names']
+    4
+    >>> stats.tokens['split_names']  # common affixes are not split
+    12
+    >>> stats.maxdepth
+    3
+
+    """
+    global _stats
+    old = _stats
+    stats = _stats = Stats()
+    try:
+        yield stats
+    finally:
+        _stats = old
+
+
+def _as_bytes(name):
+    """
+    Copy a memoryview or bytearray ``name`` to a (hashable) string
+
+    >>> _as_bytes(memoryview(b'a/b'))
+    'a/b'
+    >>> _as_bytes(bytearray(b'a/b'))
+    'a/b'
+
+    """
+    if isinstance(name, bytearray):
+        return bytes(name)
+    return name.tobytes()
+
+
+def _timed(phase, measure=None):
+    """
+    Record calls of the decorated function as ``phase`` in :func:`profile`
+
+    ``measure(args, result)`` returns the number of tokens and columns
+    handled in the call.  Recursive calls are only timed at the
+    outermost level.
+
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def new_func(*args, **kwds):
+            stats = _stats
+            if stats is None:
+                return func(*args, **kwds)
+            depth = stats._depth.get(phase, 0) + 1
+            stats._depth[phase] = depth
+            stats.maxdepth = max(stats.maxdepth, depth)
+            start = time.time()
+            try:
+                result = func(*args, **kwds)
+            finally:
+                stats._depth[phase] = depth - 1
+            elapsed = time.time() - start if depth == 1 else 0
+            (tokens, columns) = measure(args, result) if measure else (0, 0)
+            stats.add(phase, elapsed, tokens, columns)
+            return result
+        return new_func
+    return decorator
+
+
+@_same_container
 @_pass_empty_list
-def shortname(names, sep=None, skip='...', utype='tail', minlen=1):
+@_unique_names
+def shortname(names, sep=None, skip='...', utype='tail', minlen=1,
+              engine='trie', compact=False, adaptive=False, workers=1,
+              lazy=False):
     """
     Get unique short names from a list of strings
 
@@ -98,17 +366,141 @@ def shortname(names, sep=None, skip='...', utype='tail', minlen=1):
     ...            '_____x'], minlen=2)
     ['...abc___def', '...xyz___def', '...x']
 
+    ``engine`` selects the algorithm to find the shortest unique
+    window.  ``'trie'`` (default) looks at each name only up to the
+    column which tells it apart from the others and then checks the
+    names in the window found, while ``'scan'`` rebuilds the names
+    for every candidate width.  Both return the same result.
+
+    >>> shortname(['_____abc___def',
+    ...            '_____xyz___def',
+    ...            '_____xyz___uvw'], engine='scan')
+    ['c...def', 'z...def', 'z...uvw']
+
+    If ``compact`` is true, tokens are interned into integer IDs (see
+    :class:`InternedSeqList`) as the names are split, so that common
+    parts are found and the window is searched by comparing integers
+    and only the results are joined into strings.
+
+    >>> shortname(['_____abc___def',
+    ...            '_____xyz___def',
+    ...            '_____xyz___uvw'], compact=True)
+    ['c...def', 'z...def', 'z...uvw']
+
+    If ``adaptive`` is true, each name gets its own shortest unique
+    suffix (or prefix if ``utype='head'``) instead of all names
+    sharing one window (see :func:`_shortname_adaptive`).  ``engine``
+    and ``compact`` are not used then.
+
+    >>> shortname(['_____abc___def',
+    ...            '_____xyz___def',
+    ...            '_____xyz___uvw'], sep='_', adaptive=True)
+    ['abc___def', 'xyz___def', 'uvw']
+
+    ``names`` can be an :class:`Analysis`, whose ``sep`` and ``skip``
+    are used instead of the arguments.
+
+    ``workers`` processes skip the common parts of a long list (see
+    :func:`skipcommonname`).  The window is searched in this process.
+
+    If ``lazy`` is true, a :class:`LazyNames` is returned, which joins
+    the tokens of the window of a name when it is indexed.  An integer
+    ``lazy`` is the size of its cache.  Adaptive names are built to
+    check them, so they are only wrapped.
+
+    >>> view = shortname(['_____abc___def',
+    ...                   '_____xyz___def',
+    ...                   '_____xyz___uvw'], lazy=True)
+    >>> (len(view), view[1])
+    (3, 'z...def')
+
     """
-    names = list(names)
+    _check_shortname_options(utype, engine)
+    if isinstance(names, Analysis):
+        sep = names.sep
+    (names, sl) = _skipcommon_of(names, sep, skip, workers,
+                                 compact and not adaptive)
+    if adaptive:
+        if not isinstance(sep, (tuple, list)):
+            sep = (sep,)
+        labels = _shortname_adaptive(sl, utype, minlen, sep)
+        if lazy:
+            return _lazy_names(lambda indices: [labels[i] for i in indices],
+                               len(labels), lazy)
+        return labels
+    return _shortname_seqlist(sl, names, utype, minlen, engine, compact,
+                              lazy)
+
+
+def _check_shortname_options(utype, engine):
     if utype not in ['tail', 'head']:
         raise ValueError("'{0}' is not a recognized ``utype``".format(utype))
-    if not isinstance(sep, (tuple, list)):
-        sep = (sep,)
+    if engine not in _SHORTNAME_ENGINES:
+        raise ValueError(
+            "'{0}' is not a recognized ``engine``".format(engine))
+
 
-    sl = SeqList.skipcommon(names, sep, skip).filled(None)
+def _shortname_seqlist(sl, names, utype, minlen, engine, compact,
+                       lazy=False):
+    """Rest of :func:`shortname` after skipping the common parts"""
+    if compact and not isinstance(sl, InternedSeqList):
+        sl = sl.interned()
+    sl = sl.filled(None)
     if utype == 'tail':
         sl.reverseseq()
 
+    found = _SHORTNAME_ENGINES[engine](sl, names, utype, minlen)
+    if found is not None:
+        ((start, stop), subnames) = found
+        if not lazy:
+            return subnames
+        # keep the tokens of the window instead of the names
+        sl = sl.subseqlist(start, stop)
+    if utype == 'tail':
+        sl.reverseseq()
+    if lazy:
+        return _lazy_names(
+            lambda indices: sl.take(indices).joinseqs_skipping_nones(),
+            len(sl), lazy)
+    return sl.joinseqs_skipping_nones()
+
+
+def _window_names(sl, start, stop, utype):
+    """
+    Join the columns from ``start`` to ``stop`` of (filled) ``sl``
+
+    >>> sl = SeqList([['c', 'b', 'a'], ['z', 'y', None]])
+    >>> _window_names(sl, 1, 3, 'head')
+    ['ba', 'y']
+    >>> _window_names(sl, 0, 2, 'tail')
+    ['bc', 'yz']
+
+    """
+    subsl = sl.subseqlist(start, stop)
+    if utype == 'tail':
+        subsl.reverseseq()
+    return subsl.joinseqs_skipping_nones()
+
+
+def _is_unique_window(subnames, numnames, minlen):
+    return (len(set(subnames)) == numnames and
+            min(map(len, subnames)) >= minlen)
+
+
+def _measure_window(args, result):
+    sl = args[0]
+    return (len(sl) * sl.maxseqlen(), sl.maxseqlen())
+
+
+@_timed('window_search', _measure_window)
+def _shortname_scan(sl, names, utype, minlen):
+    """
+    Find the shortest unique window by trying every width in turn
+
+    Returns ``(start, stop)`` of the window and the joined names in it
+    or None if there is no such window.
+
+    """
     numnames = len(set(names))
     i0set = False
     for i in range(sl.maxseqlen()):
@@ -116,20 +508,250 @@ def shortname(names, sep=None, skip='...', utype='tail', minlen=1):
             i0 = i
             i0set = True
         if i0set:
-            subsl = sl.subseqlist(i0, i + 1)
-            if utype == 'tail':
-                subsl.reverseseq()
-            subnames = subsl.joinseqs_skipping_nones()
-            if (len(set(subnames)) == numnames and
-                min(map(len, subnames)) >= minlen):
-                return subnames
+            subnames = _window_names(sl, i0, i + 1, utype)
+            if _is_unique_window(subnames, numnames, minlen):
+                return ((i0, i + 1), subnames)
+
+
+@_timed('window_search', _measure_window)
+def _shortname_trie(sl, names, utype, minlen):
+    """
+    Find the shortest unique window by splitting the sequences apart
+
+    The window starts at the first non-homogeneous column ``i0``.  The
+    distinct sequences are split into buckets by their tokens from
+    ``i0`` on, column by column, until each is alone in its bucket
+    (see :func:`_unique_depth`), which gives the depth at which it
+    stops sharing its tokens with others.  The deepest of these (and
+    the width needed to satisfy ``minlen``)
+    is a lower bound of the window width that :func:`_shortname_scan`
+    would find, so only that width is checked in the usual way.  The
+    check is repeated on wider windows only when joining the tokens
+    makes distinct sequences collide.  Returns the same as
+    :func:`_shortname_scan`.
+
+    """
+    maxlen = sl.maxseqlen()
+    for i0 in range(maxlen):
+        if not sl.col(i0).homo():
+            break
+    else:
+        return None
+
+    distinct = _distinct_indices(names)
+    # Only the columns from i0 are converted to lists of tokens, in
+    # windows of doubling width until they tell the rows apart.
+    stop = i0
+    while True:
+        stop = min(maxlen, i0 + (2 * (stop - i0) or 1))
+        rows = list(sl.subseqlist(i0, stop).take(distinct))
+        udepth = _unique_depth(rows, 0)
+        ldepth = _minlen_depth(rows, 0, minlen, sl.tokenwidth)
+        if udepth is not None and ldepth is not None:
+            break
+        if stop == maxlen:
+            return None
+    width = max(udepth, ldepth)
+    numnames = len(rows)
+    for i in range(i0 + width - 1, maxlen):
+        subnames = _window_names(sl, i0, i + 1, utype)
+        if _is_unique_window(subnames, numnames, minlen):
+            return ((i0, i + 1), subnames)
+
+
+def _distinct_indices(names):
+    """
+    Indices of the first occurrences of the distinct ``names``
+
+    >>> _distinct_indices(['a', 'b', 'a', 'c'])
+    [0, 1, 3]
+
+    """
+    seen = set()
+    indices = []
+    for (i, name) in enumerate(names):
+        if name not in seen:
+            seen.add(name)
+            indices.append(i)
+    return indices
+
+
+def _unique_depth(rows, i0):
+    """
+    Number of columns from ``i0`` needed to tell ``rows`` apart
+
+    Returns None if some rows cannot be told apart.
+
+    >>> _unique_depth([['a', 'b', 'c'], ['a', 'b', 'd'], ['a', 'x', 'c']], 0)
+    3
+    >>> _unique_depth([['a', 'b', 'c'], ['a', 'x', 'c']], 1)
+    1
+    >>> _unique_depth([['a', 'b'], ['a', 'b']], 0) is None
+    True
+
+    """
+    # Split buckets of rows by the token in each column in turn, as in
+    # _shortname_adaptive, and drop the rows left alone, so that only
+    # the columns up to the returned depth are looked at.
+    depth = 0
+    buckets = [range(len(rows))]
+    i = i0
+    while buckets:
+        colliding = []
+        for bucket in buckets:
+            subs = {}
+            for r in bucket:
+                if i < len(rows[r]):
+                    subs.setdefault(rows[r][i], []).append(r)
+                elif len(bucket) > 1:
+                    return None
+            for sub in subs.values():
+                if len(sub) == 1:
+                    depth = i - i0 + 1
+                else:
+                    colliding.append(sub)
+        buckets = colliding
+        i += 1
+    return depth
+
+
+def _tokenwidth(token):
+    return 0 if token is None else len(token)
+
+
+def _minlen_depth(rows, i0, minlen, tokenwidth=_tokenwidth):
+    """
+    Number of columns from ``i0`` needed to make every name ``minlen`` long
+
+    Returns None if some rows are too short.
+
+    >>> _minlen_depth([['ab', 'c'], ['a', None, 'bc']], 0, 3)
+    3
+    >>> _minlen_depth([['ab', 'c'], ['a', None, 'bc']], 1, 3) is None
+    True
+
+    """
+    depth = 1
+    for seq in rows:
+        length = 0
+        for i in range(i0, len(seq)):
+            length += tokenwidth(seq[i])
+            if length >= minlen:
+                depth = max(depth, i - i0 + 1)
+                break
+        else:
+            return None
+    return depth
+
+
+@_timed('window_search', _measure_window)
+def _shortname_adaptive(sl, utype, minlen, seplist):
+    """
+    Find the shortest unique prefix (``utype='head'``) or suffix of each
+    sequence in ``sl``
+
+    After dropping the tokens shared by all sequences, the sequences
+    are put in one bucket and each bucket with more than one sequence
+    is split by the next token, so only colliding sequences are looked
+    at again.  A sequence which is left alone in its bucket (or has no
+    more tokens) is done.  It is then extended to be ``minlen`` long
+    and not to end with a separator.
+
+    >>> sl = SeqList([['a', '/', 'x', '/', 'c'],
+    ...               ['b', '/', 'x', '/', 'c'],
+    ...               ['b', '/', 'y', '/', 'c']])
+    >>> _shortname_adaptive(sl, 'tail', 1, ['/'])
+    ['a/x', 'b/x', 'y']
+    >>> _shortname_adaptive(sl, 'head', 1, ['/'])
+    ['a', 'b/x', 'b/y']
+    >>> _shortname_adaptive(sl, 'head', 2, ['/'])
+    ['a/x', 'b/x', 'b/y']
+
+    """
     if utype == 'tail':
-        sl.reverseseq()
-    return sl.joinseqs_skipping_nones()
+        rows = [s[::-1] for s in sl]
+    else:
+        rows = list(sl)
+    if len(set(map(tuple, rows))) < 2:
+        return sl.joinseqs()
+
+    # skip leading tokens shared by all rows, but keep one token each
+    i0 = 0
+    minrowlen = min(map(len, rows))
+    while i0 < minrowlen - 1 and len(set(r[i0] for r in rows)) == 1:
+        i0 += 1
+
+    stops = [None] * len(rows)
+    buckets = [range(len(rows))]
+    k = i0
+    while buckets:
+        colliding = []
+        for bucket in buckets:
+            subs = {}
+            for r in bucket:
+                if k < len(rows[r]):
+                    subs.setdefault(rows[r][k], []).append(r)
+                else:
+                    stops[r] = k
+            for sub in subs.values():
+                if len(sub) == 1:
+                    stops[sub[0]] = k + 1
+                else:
+                    colliding.append(sub)
+        buckets = colliding
+        k += 1
+
+    seps = set(s for s in seplist if s)
+    spans = []
+    for (row, stop) in zip(rows, stops):
+        start = i0
+        width = sum(map(sl.tokenwidth, row[start:stop]))
+        while stop < len(row) and (width < minlen or row[stop - 1] in seps):
+            width += sl.tokenwidth(row[stop])
+            stop += 1
+        while start > 0 and width < minlen:
+            start -= 1
+            width += sl.tokenwidth(row[start])
+        spans.append([start, stop])
+
+    # different tokens can be joined into the same string; widen them
+    while True:
+        labels = _span_names(sl, rows, spans, utype)
+        index = {}
+        for (i, label) in enumerate(labels):
+            index.setdefault(label, []).append(i)
+        widened = False
+        for group in index.values():
+            if len(group) < 2:
+                continue
+            for i in group:
+                if spans[i][1] < len(rows[i]):
+                    spans[i][1] += 1
+                    widened = True
+                elif spans[i][0] > 0:
+                    spans[i][0] -= 1
+                    widened = True
+        if not widened:
+            return labels
+
+
+def _span_names(sl, rows, spans, utype):
+    labels = [row[start:stop] for (row, (start, stop)) in zip(rows, spans)]
+    if utype == 'tail':
+        labels = [label[::-1] for label in labels]
+    return sl._new(labels).joinseqs()
+
 
+_SHORTNAME_ENGINES = {
+    'trie': _shortname_trie,
+    'scan': _shortname_scan,
+}
 
+
+@_same_container
 @_pass_empty_list
-def shortpath(names, skip='...', utype='tail', minlen=1):
+def shortpath(names, skip='...', utype='tail', minlen=1, engine='trie',
+              compact=False, adaptive=False, workers=1, lazy=False):
     """
     Get unique short paths from a list of strings
 
@@ -142,11 +764,15 @@ def shortpath(names, skip='...', utype='tail', minlen=1):
     ['ABC/.../DEF', 'XYZ/.../DEF', 'XYZ/.../UVW']
 
     """
-    return shortname(names, os.path.sep, skip, utype, minlen)
+    _check_path_analysis(names)
+    return shortname(names, os.path.sep, skip, utype, minlen, engine,
+                     compact, adaptive, workers, lazy)
 
 
+@_same_container
 @_pass_empty_list
-def skipcommonname(names, sep=None, skip='...'):
+@_unique_names
+def skipcommonname(names, sep=None, skip='...', workers=1, lazy=False):
     """
     Generate unique names from a list of strings
 
@@ -168,31 +794,302 @@ def skipcommonname(names, sep=None, skip='...'):
     ...                sep=('|', '_'), skip='*')
     ['aa|*|*_e', 'ab|*|*_d', 'ab|*|*_e']
 
+    ``names`` can be an :class:`Analysis`, whose ``sep`` and ``skip``
+    are used instead of the arguments.
+
+    A long list is split into shards processed by a pool of
+    ``workers`` processes (``None`` means the number of CPUs).  See
+    :func:`_skipcommon_parallel`.
+
+    >>> skipcommonname(['aaxxxxc', 'abxxxxb', 'abxxxxc'], workers=2)
+    ['aa...c', 'ab...b', 'ab...c']
+
+    If ``lazy`` is true, only the common parts are found (as by
+    :func:`iskipcommonname`) and a :class:`LazyNames` is returned,
+    which renders a name when it is indexed.  An integer ``lazy`` is
+    the size of its cache.
+
+    >>> view = skipcommonname(['aaxxxxc', 'abxxxxb', 'aaxxxxc'], lazy=True)
+    >>> (len(view), view[2], list(view))
+    (3, 'aa...c', ['aa...c', 'ab...b', 'aa...c'])
+
+    """
+    if lazy and not isinstance(names, Analysis):
+        names = list(names)
+        seplist = sep if isinstance(sep, (tuple, list)) else (sep,)
+        shards = _shards(len(names), workers)
+        if len(shards) > 1:
+            root = _skipcommon_parallel(names, seplist, skip, shards,
+                                        render=False)
+        else:
+            root = _stream_tree(lambda: iter(names), seplist, skip)
+        return _lazy_names(
+            lambda indices: [''.join(root.render(names[i], seplist, skip, 0))
+                             for i in indices],
+            len(names), lazy)
+    sl = _skipcommon_of(names, sep, skip, workers)[1]
+    if lazy:
+        return _lazy_names(lambda indices: sl.take(indices).joinseqs(),
+                           len(sl), lazy)
+    return sl.joinseqs()
+
+
+def _skipcommon_of(names, sep, skip, workers=1, compact=False):
+    """
+    Return ``names`` as a list and :meth:`SeqList.skipcommon` of them
+
+    If ``names`` is an :class:`Analysis`, its distinct names and cached
+    result are returned.  If ``compact`` is true, tokens are interned
+    into an :class:`InternedSeqList` while the common parts are found,
+    unless they are found by other processes.
+
     """
+    if isinstance(names, Analysis):
+        return (names.distinct, names.seqlist)
     names = list(names)
     if not isinstance(sep, (tuple, list)):
         sep = (sep,)
-    return SeqList.skipcommon(names, sep, skip).joinseqs()
+    shards = _shards(len(names), workers)
+    if len(shards) > 1:
+        return (names, SeqList(_skipcommon_parallel(names, sep, skip,
+                                                    shards)))
+    vocab = _Vocabulary() if compact else None
+    return (names, SeqList.skipcommon(names, sep, skip, vocab))
+
+
+_SHARD_MIN_NAMES = 10000
+"""Minimal number of names in a shard processed by another process"""
+
+
+def _shards(num, workers):
+    """
+    Split ``range(num)`` into at most ``workers`` ``(start, stop)`` shards
+
+    >>> _shards(25000, 2)
+    [(0, 12500), (12500, 25000)]
+    >>> _shards(25000, 4)
+    [(0, 10000), (10000, 20000), (20000, 25000)]
+    >>> _shards(25000, 1)
+    [(0, 25000)]
+
+    """
+    if workers is None:
+        import multiprocessing
+        workers = multiprocessing.cpu_count()
+    size = max(-(-num // max(workers, 1)), _SHARD_MIN_NAMES)
+    return [(start, min(start + size, num))
+            for start in range(0, num, size)] or [(0, 0)]
 
 
-def _split_names(names, sep):
+def _skipcommon_parallel(names, seplist, skip, shards, render=True):
+    """
+    Return the sequences of :meth:`SeqList.skipcommon` of ``names``
+    computed by a process for each of ``shards``
+
+    This is :func:`iskipcommonname` split by rows.  For each separator,
+    every process feeds its shard to a copy of the :class:`_StreamNode`
+    tree and the copies are merged (:meth:`_StreamNode.merge` ORs their
+    diff masks).  Then every process renders its shard.  ``names`` are
+    given to the processes when they start, which does not copy them
+    where processes are forked, and only trees and results are sent
+    afterwards.  If ``render`` is false, the tree is returned instead.
+
+    """
+    import multiprocessing
+    pool = multiprocessing.Pool(len(shards), _init_shard_worker, (names,))
+    try:
+        root = _StreamNode()
+        for _level in range(len(seplist)):
+            parts = pool.map(_feed_shard,
+                             [(root, shard, seplist, skip)
+                              for shard in shards], 1)
+            root = parts[0]
+            for part in parts[1:]:
+                root.merge(part)
+            root.finish(seplist, skip, 0)
+        if not render:
+            return root
+        results = pool.map(_render_shard,
+                           [(root, shard, seplist, skip)
+                            for shard in shards], 1)
+    finally:
+        pool.close()
+        pool.join()
+    return [row for rows in results for row in rows]
+
+
+_shard_names = None
+
+
+def _init_shard_worker(names):
+    global _shard_names
+    _shard_names = names
+
+
+def _feed_shard(task):
+    (root, (start, stop), seplist, skip) = task
+    for name in itertools.islice(_shard_names, start, stop):
+        root.feed(name, seplist, skip, 0)
+    return root
+
+
+def _render_shard(task):
+    (root, (start, stop), seplist, skip) = task
+    return [root.render(name, seplist, skip, 0)
+            for name in itertools.islice(_shard_names, start, stop)]
+
+
+def _measure_lol(lol):
+    if not lol:
+        return (0, 0)
+    return (sum(map(len, lol)), max(map(len, lol)))
+
+
+@_timed('split_names', lambda args, result: _measure_lol(result[0]))
+def _split_names(names, sep, vocab=None):
     """
     Split strings in ``names`` and returns ``(names, sep)`` pair
 
+    If ``vocab`` is given, the tokens of each name are interned into
+    an ``array('i')`` of IDs as soon as it is split.
+
     >>> _split_names(['abc'], None)
     ([['a', 'b', 'c']], '')
     >>> _split_names(['a/b/c'], '/')
     ([['a', 'b', 'c']], '/')
+    >>> _split_names([memoryview(b'a/b')], b'/')
+    ([['a', 'b']], '/')
+    >>> _split_names(['a/b', 'b'], '/', _Vocabulary())
+    ([array('i', [1, 2]), array('i', [2])], '/')
 
     """
+    names = [_as_bytes(n) if isinstance(n, _BUFFER_TYPES) else n
+             for n in names]
+    if vocab is not None:
+        if sep is None:
+            return ([vocab.internseq(n) for n in names], '')
+        return ([vocab.internseq(n.split(sep)) for n in names], sep)
     if sep is None:
         return ([list(n) for n in names], '')
     else:
         return ([n.split(sep) for n in names], sep)
 
 
+def _split_chunks(names, sep, vocab=None):
+    """
+    Split ``names`` by ``sep`` and find their chunks
+
+    This returns ``(lol, sep, chunks)`` as :func:`_split_names`
+    followed by :func:`_get_chunks` would, but only the part of each
+    name between the prefix and suffix common to all names (see
+    :func:`_common_affixes`) is split and compared.  ``vocab`` is
+    passed to :func:`_split_names`.
+
+    >>> (lol, sep, chunks) = _split_chunks(['r/s/a/x/f', 'r/s/b/x/f'], '/')
+    >>> lol
+    [['r', 's', 'a', 'x', 'f'], ['r', 's', 'b', 'x', 'f']]
+    >>> chunks
+    ([(0, 2), (2, 3), (3, 5)], [False, True, False])
+
+    """
+    names = [_as_bytes(n) if isinstance(n, _BUFFER_TYPES) else n
+             for n in names]
+    (prefix, suffix) = _common_affixes(names, sep)
+    if not (prefix or suffix):
+        (lol, sep) = _split_names(names, sep, vocab)
+        return (lol, sep, _get_chunks(lol, None if sep else names))
+    stop = -len(suffix) or None
+    middles = [n[len(prefix):stop] for n in names]
+    (lol, sep) = _split_names(middles, sep, vocab)
+    chunks = _get_chunks(lol, None if sep else middles)
+    if sep:
+        pretokens = prefix[:-len(sep)].split(sep) if prefix else []
+        suftokens = suffix[len(sep):].split(sep) if suffix else []
+    else:
+        pretokens = list(prefix)
+        suftokens = list(suffix)
+    if vocab is not None:
+        pretokens = vocab.internseq(pretokens)
+        suftokens = vocab.internseq(suftokens)
+    lol = [pretokens + row + suftokens for row in lol]
+    return (lol, sep, _pad_chunks(chunks, len(pretokens), len(suftokens)))
+
+
+def _common_affixes(names, sep):
+    """
+    Return the prefix and suffix common to ``names`` at ``sep`` boundaries
+
+    The prefix ends with ``sep`` and the suffix starts with it, so that
+    the tokens of each name are those of the prefix, of the rest and of
+    the suffix.  The suffix is used only if every name has the same
+    number of tokens, because the chunks align tokens from the head.
+
+    >>> _common_affixes(['/mnt/a/x/out.h5', '/mnt/b/out.h5'], '/')
+    ('/mnt/', '')
+    >>> _common_affixes(['/mnt/a/x/out.h5', '/mnt/b/y/out.h5'], '/')
+    ('/mnt/', '/out.h5')
+    >>> _common_affixes(['abxc', 'abyc'], None)
+    ('ab', 'c')
+
+    Unicode names mixed with non-ASCII byte strings cannot be ordered,
+    so they have no common affixes:
+
+    >>> _common_affixes([u'a/\xe9', 'a/\xc3'], '/')
+    ('', '')
+
+    """
+    if len(names) < 2 or (sep is not None and len(sep) != 1):
+        return ('', '')
+    try:
+        if min(names) == max(names):
+            return ('', '')
+        prefix = os.path.commonprefix(names)
+        suffix = os.path.commonprefix([n[::-1] for n in names])[::-1]
+    except UnicodeDecodeError:
+        return ('', '')
+    if sep:
+        prefix = prefix[:prefix.rfind(sep) + 1]
+        suffix = suffix[suffix.find(sep):] if sep in suffix else ''
+        numtokens = set(n.count(sep) for n in names)
+    else:
+        numtokens = set(map(len, names))
+    if (suffix and
+            (len(numtokens) > 1 or
+             min(map(len, names)) < len(prefix) + len(suffix))):
+        suffix = ''
+    return (prefix, suffix)
+
+
+def _pad_chunks(chunks, before, after):
+    """
+    Put common chunks of ``before`` and ``after`` columns around ``chunks``
+
+    >>> _pad_chunks(([(0, 1), (1, 3)], [False, True]), 2, 1)
+    ([(0, 3), (3, 5), (5, 6)], [False, True, False])
+
+    """
+    padded = []
+    if before:
+        padded.append(((0, before), False))
+    padded.extend(((start + before, stop + before), diff)
+                  for ((start, stop), diff) in zip(*chunks))
+    if after:
+        stop = padded[-1][0][1]
+        padded.append(((stop, stop + after), False))
+    ranges = []
+    diffs = []
+    for ((start, stop), diff) in padded:
+        if diffs and not diff and not diffs[-1]:
+            ranges[-1] = (ranges[-1][0], stop)
+        else:
+            ranges.append((start, stop))
+            diffs.append(diff)
+    return (ranges, diffs)
+
+
+@_same_container
 @_pass_empty_list
-def skipcommonpath(paths, skip='...'):
+def skipcommonpath(paths, skip='...', workers=1, lazy=False):
     """
     Generate unique names from a list of file paths
 
@@ -204,86 +1101,605 @@ def skipcommonpath(paths, skip='...'):
     ['*/ac', '*/bc']
 
     """
-    return skipcommonname(paths, os.path.sep, skip)
+    _check_path_analysis(paths)
+    return skipcommonname(paths, os.path.sep, skip, workers, lazy)
 
 
-def _skip_common_parts_in_lol(lol, chunks, sep, skip):
-    return list(_skip_common_parts(n, chunks, sep, skip) for n in lol)
+def _check_path_analysis(paths):
+    if isinstance(paths, Analysis) and paths.sep != (os.path.sep,):
+        raise ValueError(
+            "Analysis of paths must be split by '{0}'".format(os.path.sep))
 
 
-def _skip_common_parts(name, chunks, sep, skip):
+def iskipcommonname(source, sep=None, skip='...'):
     """
-    Convert common parts in ``name`` to ``skip``
+    Iterate over :func:`skipcommonname` of the names in ``source``
 
-    Skipping is avoided if it makes name longer.
+    ``source`` is read once per separator to find the common parts and
+    once more to yield the results one by one.  Only the first name
+    and which of its columns differ are kept, so memory depends on
+    the depth of the names but not on their number.  ``source`` must
+    be iterable more than once: a list, a function returning a new
+    iterator each time or the path of a file of names, one per line.
 
-    >>> chunks = ([(0, 5), (5, 10), (10, 15)], [True, False, True])
-    >>> _skip_common_parts(list('aaaaa*****ccccc'), chunks, '', '...')
-    'aaaaa...ccccc'
-    >>> chunks = ([(0, 1), (1, 2), (2, 3)], [True, False, True])
-    >>> _skip_common_parts(['a', '*', 'c'], chunks, '/', '...')
-    'a/*/c'
-    >>> _skip_common_parts(['aaaaa', '*****', 'ccccc'], chunks, '/', '...')
-    'aaaaa/.../ccccc'
-    >>> _skip_common_parts(['aaaaa', '*****'], chunks, '/', '...')
-    'aaaaa/...'
+    >>> list(iskipcommonname(['aaxxxxc', 'abxxxxb', 'abxxxxc']))
+    ['aa...c', 'ab...b', 'ab...c']
+    >>> names = ['aa|c|d_e', 'ab|c|d_d', 'ab|c|d_e']
+    >>> list(iskipcommonname(lambda: iter(names), ('|', '_'), '*'))
+    ['aa|*|*_e', 'ab|*|*_d', 'ab|*|*_e']
 
     """
-    return sep.join(_skip_common_parts_as_list(name, chunks, len(sep), skip))
+    if not isinstance(sep, (tuple, list)):
+        sep = (sep,)
+    return _iskipcommon(_reiterable(source), sep, skip)
 
 
-def _every_other(iterative, sep, head=False, tail=False):
+def iskipcommonpath(source, skip='...'):
     """
-    Put ``sep`` into every other element in ``iterative``
+    Iterate over :func:`skipcommonpath` of the paths in ``source``
 
-    >>> list(_every_other([1, 2, 3], 0))
-    [1, 0, 2, 0, 3]
-    >>> list(_every_other([1, 2, 3], 0, head=True, tail=True))
-    [0, 1, 0, 2, 0, 3, 0]
+    See :func:`iskipcommonname` for ``source``.
+
+    >>> list(iskipcommonpath(['a/a/c', 'a/b/c'], skip='*'))
+    ['*/a/*', '*/b/*']
 
     """
-    iterative = iter(iterative)
-    if head:
-        yield sep
-    yield iterative.next()
-    for elem in iterative:
-        yield sep
-        yield elem
-    if tail:
-        yield sep
+    return iskipcommonname(source, os.path.sep, skip)
 
 
-def _skip_common_parts_as_list(name, chunks, sepwidth, skip):
-    skipwidth = len(skip)
-    newname = []
-    for ((start, stop), diff) in zip(*chunks):
-        subname = name[start:stop]
-        subwidth = sum(map(len, subname)) + sepwidth * (stop - start)
-        if diff or subwidth < skipwidth:
-            newname.extend(subname)
-        else:
-            newname.append(skip)
-    return newname
+def _iskipcommon(iternames, seplist, skip):
+    root = _stream_tree(iternames, seplist, skip)
+    if root.count == 0:
+        return
+    for name in iternames():
+        yield ''.join(root.render(name, seplist, skip, 0))
 
 
-def _get_chunks(lol):
-    """
-    Returns common and different "chunks" of the list in the list (``lol``)
+def _stream_tree(iternames, seplist, skip):
+    """Return the :class:`_StreamNode` tree fed by every pass"""
+    root = _StreamNode()
+    for _level in range(len(seplist)):
+        for name in iternames():
+            root.feed(name, seplist, skip, 0)
+        if root.count == 0:
+            break
+        root.finish(seplist, skip, 0)
+    return root
 
-    Data structure of chunks
-    ------------------------
 
-    chunks : (ranges, diffs)
-        Common and different chunks
+def _reiterable(source):
+    """
+    Return a function which returns a new iterator over ``source``
 
-        ranges : [(start, stop)]
-            A list of ranges (start-stop pairs)
+    >>> _reiterable(iter([]))
+    Traceback (most recent call last):
+      ...
+    TypeError: source must be iterable more than once
 
-            start : int
-                The first index of the range
+    """
+    if isinstance(source, basestring):
+        return lambda: (line.strip() for line in _iter_lines(source))
+    if callable(source):
+        return source
+    if iter(source) is source:
+        raise TypeError('source must be iterable more than once')
+    return lambda: iter(source)
+
+
+def _split_value(value, sep):
+    if isinstance(value, _BUFFER_TYPES):
+        value = _as_bytes(value)
+    if sep is None:
+        return (list(value), '')
+    return (value.split(sep), sep)
 
-            stop : int
-                The last + 1 index of the range
+
+class _StreamNode(object):
+
+    """
+    Streaming :meth:`SeqList.skipcommon` of the values of one column
+
+    While ``chunks`` is None, values are fed to find them: the first
+    value split by the separator of this level is kept and ``diff`` is
+    updated as :func:`_diff_list` of all of them would be.  After
+    :meth:`finish`, values are rendered and each column of the result
+    is fed to a child node for the next separator.  A child whose
+    values are all the same separator or ``skip`` is a leaf and is
+    rendered as it is, like in :meth:`SeqList._skipcommon_recursive`.
+
+    """
+
+    __slots__ = ('count', 'value', 'homo', 'first', 'diff', 'chunks',
+                 'children', 'leaf')
+
+    def __init__(self):
+        self.count = 0
+        self.value = None
+        self.homo = True
+        self.first = None
+        self.diff = []
+        self.chunks = None
+        self.children = []
+        self.leaf = False
+
+    def feed(self, value, seplist, skip, level):
+        if self.chunks is not None:
+            row = self._render_row(value, seplist[level], skip)
+            if level + 1 == len(seplist):
+                return
+            while len(self.children) < len(row):
+                self.children.append(_StreamNode())
+            for (child, item) in zip(self.children, row):
+                if not child.leaf:
+                    child.feed(item, seplist, skip, level + 1)
+            return
+        if self.count == 0:
+            self.value = value
+        elif self.homo and value != self.value:
+            self.homo = False
+        self.count += 1
+        tokens = _split_value(value, seplist[level])[0]
+        if self.first is None:
+            self.first = tokens
+            self.diff = [False] * len(tokens)
+            return
+        first = self.first
+        diff = self.diff
+        if len(tokens) > len(diff):
+            # the first value is shorter than these tokens
+            diff.extend([True] * (len(tokens) - len(diff)))
+        for i in range(len(diff)):
+            if not diff[i] and (i >= len(tokens) or i >= len(first) or
+                                first[i] != tokens[i]):
+                diff[i] = True
+
+    def merge(self, other):
+        """
+        Merge ``other``, a copy of this node fed with the values after
+        those fed to this one
+        """
+        if self.chunks is not None:
+            for (i, child) in enumerate(other.children):
+                if i == len(self.children):
+                    self.children.append(child)
+                elif not child.leaf:
+                    self.children[i].merge(child)
+            return
+        if other.count == 0:
+            return
+        if self.count == 0:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            return
+        self.count += other.count
+        self.homo = (self.homo and other.homo and
+                     self.value == other.value)
+        (first, diff) = (self.first, self.diff)
+        (ofirst, odiff) = (other.first, other.diff)
+        # A column not in all values of one node differs, and so does
+        # one in which the first values of the nodes differ.
+        self.diff = [i >= len(diff) or i >= len(odiff) or
+                     diff[i] or odiff[i] or first[i] != ofirst[i]
+                     for i in range(max(len(diff), len(odiff)))]
+
+    def finish(self, seplist, skip, level):
+        """Finish the pass feeding the deepest nodes"""
+        if self.chunks is None:
+            self.chunks = _chunks_from_diffs(self.diff)
+            self.first = self.diff = None
+            return
+        sep = seplist[level] or ''
+        for child in self.children:
+            if child.chunks is None and child.homo and \
+                    child.value in (sep, skip):
+                child.leaf = True
+            if not child.leaf:
+                child.finish(seplist, skip, level + 1)
+
+    def render(self, value, seplist, skip, level):
+        """Return the tokens of the result for ``value``"""
+        row = self._render_row(value, seplist[level], skip)
+        if level + 1 == len(seplist):
+            return row
+        tokens = []
+        for (child, item) in zip(self.children, row):
+            if child.leaf:
+                tokens.append(item)
+            else:
+                tokens.extend(child.render(item, seplist, skip, level + 1))
+        return tokens
+
+    def _render_row(self, value, sep, skip):
+        (tokens, sep) = _split_value(value, sep)
+        row = _skip_common_parts_as_list(tokens, self.chunks, len(sep), skip)
+        if sep and row:
+            items = row
+            row = [sep] * (2 * len(items) - 1)
+            row[::2] = items
+        return row
+
+
+class Analysis(object):
+
+    """
+    Split names and their common parts, shared by several methods
+
+    :func:`shortname`, :func:`shortpath`, :func:`skipcommonname` and
+    :func:`skipcommonpath` accept an analysis in place of a list of
+    names.  Each attribute below is computed when it is first used and
+    kept, so the second method called only renders its result.
+
+    >>> analysis = Analysis(['some/long/path/ABC/middle/part/DEF',
+    ...                      'some/long/path/XYZ/middle/part/DEF',
+    ...                      'some/long/path/XYZ/middle/part/UVW'], '/')
+    >>> shortpath(analysis)
+    ['ABC/.../DEF', 'XYZ/.../DEF', 'XYZ/.../UVW']
+    >>> skipcommonpath(analysis)
+    ['.../ABC/.../DEF', '.../XYZ/.../DEF', '.../XYZ/.../UVW']
+    >>> analysis.chunks
+    ([(0, 3), (3, 4), (4, 6), (6, 7)], [False, True, False, True])
+    >>> analysis.homo
+    [True, True, True, False, True, True, False]
+
+    Attributes
+    ----------
+
+    names : list
+        Names as given.
+    sep : tuple
+        Separators; a single separator is given as a 1-tuple.
+    skip : str
+        The mark replacing common parts.
+    distinct : list
+        Distinct names in the order they first appear.  The following
+        attributes are about these names.
+    tokens : list of list
+        Names split by the first separator.
+    chunks : tuple
+        Common and different chunks of ``tokens``, as returned by
+        :func:`_get_chunks`.
+    homo : list of bool
+        True for each column of ``tokens`` which is the same for all
+        names.
+    seqlist : SeqList
+        Result of :meth:`SeqList.skipcommon`.
+
+    """
+
+    def __init__(self, names, sep=None, skip='...'):
+        if not isinstance(sep, (tuple, list)):
+            sep = (sep,)
+        self.names = list(names)
+        self.sep = tuple(sep)
+        self.skip = skip
+        (self.distinct, self._inverse) = _dedupe(self.names)
+        self._tokens = None
+        self._chunks = None
+        self._seqlist = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return '{0}({1!r}, {2!r}, {3!r})'.format(
+            self.__class__.__name__, self.names, self.sep, self.skip)
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            (self._tokens, _, self._chunks) = _split_chunks(
+                self.distinct, self.sep[0])
+        return self._tokens
+
+    @property
+    def chunks(self):
+        if self._chunks is None:
+            self.tokens
+        return self._chunks
+
+    @property
+    def homo(self):
+        (ranges, diffs) = self.chunks
+        return [not d for ((start, stop), d) in zip(ranges, diffs)
+                for _ in range(start, stop)]
+
+    @property
+    def seqlist(self):
+        if self._seqlist is None:
+            if len(self.sep) > 1:
+                self._seqlist = SeqList.skipcommon(
+                    self.distinct, self.sep, self.skip)
+            else:
+                self._seqlist = SeqList._skipcommon_recursive(
+                    self.distinct, self.sep, self.skip,
+                    lol=self.tokens, chunks=self.chunks)
+        return self._seqlist
+
+    def expand(self, results):
+        """Map ``results`` for the distinct names back to all names"""
+        if len(self.distinct) == len(self.names):
+            return results
+        if isinstance(results, LazyNames):
+            return results.reindex(self._inverse)
+        return [results[i] for i in self._inverse]
+
+
+def fit(names, sep=None, skip='...', refit=True):
+    """
+    Learn the layout of common and different parts of ``names``
+
+    Returns a :class:`Template` which shortens new names in the same
+    way as :func:`skipcommonname`, with one split and slicing per
+    name.  Only a single separator is supported.
+
+    >>> tmpl = fit(['runs/2020/exp1/seed-1/out.log',
+    ...             'runs/2021/exp2/seed-2/out.log'], sep='/')
+    >>> tmpl('runs/2022/exp9/seed-3/out.log')
+    '.../2022/exp9/seed-3/...'
+
+    A name which does not fit in the template (e.g., differs from the
+    common parts) makes the template refit with the name added, if
+    ``refit`` is true.  Otherwise ValueError is raised.
+
+    >>> tmpl('runs/2022/exp9/seed-3/err.log')
+    '.../2022/exp9/seed-3/err.log'
+    >>> tmpl('runs/2020/exp1/seed-1/out.log')
+    '.../2020/exp1/seed-1/out.log'
+
+    """
+    if isinstance(sep, (tuple, list)):
+        if len(sep) != 1:
+            raise ValueError("fit() supports only one separator")
+        (sep,) = sep
+    return Template(names, sep, skip, refit)
+
+
+class Template(object):
+
+    """
+    Shortener fitted by :func:`fit`
+
+    Call it with a name to get its short name.  The short name is the
+    same as what :func:`skipcommonname` gives for that name when it
+    is called with the names used for fitting plus that name.
+
+    """
+
+    def __init__(self, names, sep, skip, refit):
+        self._sep = sep
+        self._skip = skip
+        self._refit = refit
+        self._sample = set()
+        self._fit(names)
+
+    def _fit(self, names):
+        self._sample.update(names)
+        (lol, self._joiner) = _split_names(list(self._sample), self._sep)
+        chunks = _get_chunks(lol)
+        self._maxlen = chunks[0][-1][1]
+        sepwidth = len(self._joiner)
+        skipwidth = len(self._skip)
+        # List of (start, stop, common tokens, rendered tokens).
+        # Tokens are None for different parts.
+        self._parts = parts = []
+        for ((start, stop), diff) in zip(*chunks):
+            if diff:
+                parts.append((start, stop, None, None))
+                continue
+            tokens = lol[0][start:stop]
+            subwidth = sum(map(len, tokens)) + sepwidth * (stop - start)
+            if subwidth < skipwidth:
+                parts.append((start, stop, tokens, tokens))
+            else:
+                parts.append((start, stop, tokens, [self._skip]))
+
+    def matches(self, name):
+        """Return true if ``name`` fits in this template"""
+        return self._match(self._split(name))
+
+    def __call__(self, name):
+        tokens = self._split(name)
+        if not self._match(tokens):
+            if not self._refit:
+                raise ValueError(
+                    "'{0}' does not fit in the template".format(name))
+            self._fit([name])
+        return self._render(tokens)
+
+    def _split(self, name):
+        if self._sep is None:
+            return list(name)
+        return name.split(self._sep)
+
+    def _match(self, tokens):
+        for (start, stop, common, _) in self._parts:
+            if common is not None and tokens[start:stop] != common:
+                return False
+        return True
+
+    def _render(self, tokens):
+        newname = []
+        for (start, stop, _, rendered) in self._parts:
+            if rendered is None:
+                newname.extend(tokens[start:stop])
+            else:
+                newname.extend(rendered)
+        # parts beyond the fitted names are different from them
+        newname.extend(tokens[self._maxlen:])
+        return self._joiner.join(newname)
+
+
+def _skip_common_parts_in_lol(lol, chunks, sep, skip):
+    return list(_skip_common_parts(n, chunks, sep, skip) for n in lol)
+
+
+def _skip_common_parts(name, chunks, sep, skip):
+    """
+    Convert common parts in ``name`` to ``skip``
+
+    Skipping is avoided if it makes name longer.
+
+    >>> chunks = ([(0, 5), (5, 10), (10, 15)], [True, False, True])
+    >>> _skip_common_parts(list('aaaaa*****ccccc'), chunks, '', '...')
+    'aaaaa...ccccc'
+    >>> chunks = ([(0, 1), (1, 2), (2, 3)], [True, False, True])
+    >>> _skip_common_parts(['a', '*', 'c'], chunks, '/', '...')
+    'a/*/c'
+    >>> _skip_common_parts(['aaaaa', '*****', 'ccccc'], chunks, '/', '...')
+    'aaaaa/.../ccccc'
+    >>> _skip_common_parts(['aaaaa', '*****'], chunks, '/', '...')
+    'aaaaa/...'
+
+    """
+    return sep.join(_skip_common_parts_as_list(name, chunks, len(sep), skip))
+
+
+def _every_other(iterative, sep, head=False, tail=False):
+    """
+    Put ``sep`` into every other element in ``iterative``
+
+    >>> list(_every_other([1, 2, 3], 0))
+    [1, 0, 2, 0, 3]
+    >>> list(_every_other([1, 2, 3], 0, head=True, tail=True))
+    [0, 1, 0, 2, 0, 3, 0]
+
+    """
+    iterative = iter(iterative)
+    if head:
+        yield sep
+    yield iterative.next()
+    for elem in iterative:
+        yield sep
+        yield elem
+    if tail:
+        yield sep
+
+
+def _skip_common_parts_as_list(name, chunks, sepwidth, skip):
+    skipwidth = len(skip)
+    newname = []
+    for ((start, stop), diff) in zip(*chunks):
+        subname = name[start:stop]
+        subwidth = sum(map(len, subname)) + sepwidth * (stop - start)
+        if diff or subwidth < skipwidth:
+            newname.extend(subname)
+        else:
+            newname.append(skip)
+    return newname
+
+
+@_timed('skipcommon')
+def _skipcommon_flat(names, seplist, skip, vocab=None):
+    """
+    Non-recursive version of :meth:`SeqList._skipcommon_recursive`
+
+    The recursion over the columns is replaced by a stack of tasks and
+    sequences are built directly as lists of tokens, without
+    :class:`SeqList` and :class:`ColView` at each level.  Each token
+    is split once by the separator of the next level.  Returns a list
+    of sequences.
+
+    >>> los = _skipcommon_flat(['aa|c|d_e', 'ab|c|d_d'], ('|', '_'), '*')
+    >>> los[0]
+    ['aa', '|', '*', '|', '*', '_', 'e']
+    >>> los[1]
+    ['ab', '|', '*', '|', '*', '_', 'd']
+
+    If ``vocab`` (a :class:`_Vocabulary`) is given, tokens are interned
+    as values are split, so that chunks and columns are compared as
+    integer IDs, and the sequences are of token IDs.  Values are
+    turned back into strings only to be split by the next separator.
+
+    >>> vocab = _Vocabulary()
+    >>> los = _skipcommon_flat(['aa|c|d_e', 'ab|c|d_d'], ('|', '_'), '*',
+    ...                        vocab)
+    >>> [vocab.tokens[t] for t in los[1]]
+    ['ab', '|', '*', '|', '*', '_', 'd']
+
+    """
+    newlos = [[] for _ in names]
+    skipwidth = len(skip)
+    if vocab is None:
+        width = len
+        skiptoken = skip
+    else:
+        width = vocab.widths.__getitem__
+        skiptoken = vocab.intern(skip)
+    # A task (level, rows, values) splits each of ``values`` by
+    # ``seplist[level]`` and appends the result to the corresponding
+    # sequence in ``rows``.
+    stack = [(0, range(len(names)), names)]
+    while stack:
+        (level, rows, values) = stack.pop()
+        if _stats is not None:
+            # A task at ``level`` stands for a recursive call that deep.
+            _stats.maxdepth = max(_stats.maxdepth, level + 1)
+        if level == len(seplist):
+            for (i, value) in zip(rows, values):
+                newlos[i].append(value)
+            continue
+
+        if vocab is not None and level > 0:
+            values = [vocab.tokens[v] for v in values]
+        (lol, sep, chunks) = _split_chunks(values, seplist[level], vocab)
+        septoken = sep if vocab is None or not sep else vocab.intern(sep)
+
+        # Common chunks are full in every row so whether they are
+        # skipped or not can be decided by the first row.
+        plan = []
+        for ((start, stop), diff) in zip(*chunks):
+            subwidth = (sum(map(width, lol[0][start:stop])) +
+                        len(sep) * (stop - start))
+            plan.append((start, stop, diff or subwidth < skipwidth))
+        newrows = []
+        for tokens in lol:
+            row = []
+            for (start, stop, keep) in plan:
+                if keep:
+                    row.extend(tokens[start:stop])
+                else:
+                    row.append(skiptoken)
+            if sep and row:
+                items = row
+                row = [septoken] * (2 * len(items) - 1)
+                row[::2] = items
+            newrows.append(row)
+
+        tasks = []
+        for col in itertools.izip_longest(*newrows):
+            if None in col:
+                colrows = [i for (i, t) in zip(rows, col) if t is not None]
+                col = [t for t in col if t is not None]
+            else:
+                colrows = rows
+            if (col[0] in (septoken, skiptoken) and
+                    col.count(col[0]) == len(col)):
+                tasks.append((len(seplist), colrows, col))
+            else:
+                tasks.append((level + 1, colrows, col))
+        stack.extend(reversed(tasks))
+    return newlos
+
+
+@_timed('get_chunks', lambda args, result: _measure_lol(args[0]))
+def _get_chunks(lol, names=None):
+    """
+    Returns common and different "chunks" of the list in the list (``lol``)
+
+    Data structure of chunks
+    ------------------------
+
+    chunks : (ranges, diffs)
+        Common and different chunks
+
+        ranges : [(start, stop)]
+            A list of ranges (start-stop pairs)
+
+            start : int
+                The first index of the range
+
+            stop : int
+                The last + 1 index of the range
 
         diffs : [bool]
             True if the corresponding element in ``ranges`` is
@@ -299,10 +1715,32 @@ def _get_chunks(lol):
     ...              [1, 2, 1, 2, 4, 4, 1, 2]])
     ([(0, 4), (4, 6), (6, 8)], [False, True, False])
 
+    ``names`` is an optional list of strings whose characters are the
+    elements of ``lol``.  If it is given, or if the sequences are
+    interned token IDs (``array('i')``), and ``lol`` is long enough,
+    the NumPy backend (:func:`_diff_array` and
+    :func:`_chunks_from_diffs_numpy`) is used on the code points or
+    IDs as they are.  Other tokens would have to be mapped to integers
+    one by one first, which is slower than :func:`_diff_list`.
+
+    """
+    if (len(lol) >= _NUMPY_MIN_ROWS and
+            (names is not None or isinstance(lol[0], array)) and
+            _numpy() is not None):
+        return _chunks_from_diffs_numpy(_diff_array(lol, names))
+    return _chunks_from_diffs(_diff_list(lol))
+
+
+def _chunks_from_diffs(rawdiffs):
+    """
+    Group runs of the same value in ``rawdiffs`` into chunks
+
+    >>> _chunks_from_diffs([False, False, True, True, False])
+    ([(0, 2), (2, 4), (4, 5)], [False, True, False])
+
     """
     ranges = []
     diffs = []
-    rawdiffs = _diff_list(lol)
     start = 0
     d1 = rawdiffs[0]
     for (i, (d0, d1)) in enumerate(zip(rawdiffs[:-1], rawdiffs[1:])):
@@ -352,6 +1790,121 @@ def _diff_list(lol):
     return diff
 
 
+_NUMPY_MIN_ROWS = 64
+"""Minimal number of sequences to use the NumPy backend"""
+
+
+def _chunks_from_diffs_numpy(rawdiffs):
+    """
+    NumPy version of :func:`_chunks_from_diffs`
+
+    >>> np = _numpy()
+    >>> if np is not None:
+    ...     d = np.array([False, False, True, True, False])
+    ...     assert (_chunks_from_diffs_numpy(d) ==
+    ...             ([(0, 2), (2, 4), (4, 5)], [False, True, False]))
+
+    """
+    bounds = (numpy.flatnonzero(rawdiffs[1:] != rawdiffs[:-1]) + 1).tolist()
+    starts = [0] + bounds
+    stops = bounds + [len(rawdiffs)]
+    return (list(zip(starts, stops)), rawdiffs[starts].tolist())
+
+
+def _diff_array(lol, names=None):
+    """
+    NumPy version of :func:`_diff_list`; returns a boolean array
+
+    >>> if _numpy() is not None:
+    ...     assert _diff_array([[1, 2, 3],
+    ...                         [1, 2, 2],
+    ...                         [1, 1, 2]]).tolist() == [False, True, True]
+    ...     assert _diff_array([list('abc'), list('ab')],
+    ...                        ['abc', 'ab']).tolist() == [False, False, True]
+
+    """
+    packed = None
+    if names is not None:
+        packed = _pack_names(names)
+    if packed is None:
+        packed = _pack_lol(lol)
+    (codes, lengths) = packed
+    if len(lengths) == 0:
+        return numpy.zeros(0, dtype=bool)
+    codes = codes[:, :lengths.max()]
+    diff = (codes != codes[0]).any(axis=0)
+    diff[lengths.min():] = True
+    return diff
+
+
+def _pack_names(names):
+    """
+    Pack strings into a padded array of code points
+
+    Returns ``(codes, lengths)`` or None if the strings cannot be
+    packed as they are.
+
+    """
+    names = list(names)
+    arr = numpy.array(names)
+    if arr.dtype.kind == 'S':
+        dtype = numpy.uint8
+    elif arr.dtype.kind == 'U' and sys.maxunicode > 0xffff:
+        dtype = numpy.uint32
+    else:
+        return None
+    width = arr.dtype.itemsize // numpy.dtype(dtype).itemsize
+    codes = arr.view(dtype).reshape(len(names), width)
+    lengths = numpy.fromiter(itertools.imap(len, names), numpy.intp,
+                             len(names))
+    return (codes, lengths)
+
+
+def _pack_lol(lol):
+    """
+    Pack sequences into a padded array of token IDs
+
+    Each distinct element is mapped to an integer; -1 is used for
+    padding.  Sequences of interned tokens (``array('i')``) are used as
+    they are.  Returns ``(codes, lengths)``.
+
+    """
+    ids = {}
+    lengths = numpy.fromiter(itertools.imap(len, lol), numpy.intp, len(lol))
+    if lol and isinstance(lol[0], array) and lengths.max() > 0:
+        return (_fill_array(lol, -1, numpy.intc), lengths)
+    total = lengths.sum()
+    tokens = itertools.chain.from_iterable(lol)
+    flat = numpy.fromiter((ids.setdefault(t, len(ids)) for t in tokens),
+                          numpy.intp, total)
+    width = lengths.max() if len(lol) else 0
+    codes = numpy.empty((len(lol), width), dtype=numpy.intp)
+    codes.fill(-1)
+    codes[numpy.arange(width) < lengths[:, None]] = flat
+    return (codes, lengths)
+
+
+def _fill_array(lol, fill, dtype):
+    """
+    Pack sequences into a 2-D array of ``dtype`` padded with ``fill``
+
+    >>> _fill_array([['a', 'b'], ['c']], None, object).tolist()
+    [['a', 'b'], ['c', None]]
+
+    """
+    lengths = numpy.fromiter(itertools.imap(len, lol), numpy.intp, len(lol))
+    tokens = itertools.chain.from_iterable(lol)
+    if dtype is object:
+        flat = numpy.array(list(tokens), dtype=object)
+    else:
+        flat = numpy.fromiter(tokens, dtype, lengths.sum())
+    width = lengths.max()
+    arr = numpy.empty((len(lol), width), dtype=dtype)
+    arr.fill(fill)
+    arr[numpy.arange(width) < lengths[:, None]] = flat
+    return arr
+
+
 class SeqList(object):
     r"""
     List of sequence to hold data to be uniquified
@@ -374,11 +1927,19 @@ class SeqList(object):
                     |    `- 1-st column
                     `- 0-th column
 
+    Columns are built column-major, all at once, by the first call to
+    :meth:`col` and cached until the sequences are changed.  The cache
+    is a transposed copy of all the elements, so it doubles the memory
+    taken by the sequences while it is kept.
+
     """
 
+    __slots__ = ('_los', '_cols')
+
     def __init__(self, los):
         """Create SeqList from a list of sequence `los`"""
         self._los = los
+        self._cols = None
 
     def __unicode__(self):
         return u"{0}({1})".format(self.__class__.__name__, self._los)
@@ -392,11 +1953,69 @@ class SeqList(object):
     def __iter__(self):
         return iter(self._los)
 
+    def _new(self, los):
+        return self.__class__(los)
+
+    def interned(self, vocab=None):
+        """
+        Return an :class:`InternedSeqList` holding the same sequences
+
+        >>> SeqList([['a', 'b'], ['a', 'c']]).interned()
+        InternedSeqList([array('i', [1, 2]), array('i', [1, 3])])
+
+        """
+        if vocab is None:
+            vocab = _Vocabulary()
+        return InternedSeqList([vocab.internseq(s) for s in self._los], vocab)
+
+    def tokenwidth(self, token):
+        """Return the width of ``token`` in joined strings"""
+        return _tokenwidth(token)
+
+    @classmethod
+    def skipcommon(cls, names, seplist, skip, vocab=None):
+        """
+        Split ``names`` by each separator in ``seplist`` in turn and
+        replace common parts with ``skip``
+
+        With more than one separator, the non-recursive
+        :func:`_skipcommon_flat` is used instead of
+        :meth:`_skipcommon_recursive`.  If a :class:`_Vocabulary` is
+        given, tokens are interned as names are split (see
+        :func:`_skipcommon_flat`) and an :class:`InternedSeqList` is
+        returned.
+
+        >>> sl = SeqList.skipcommon(['a/x/c', 'b/x/c'], ['/'], '*',
+        ...                         _Vocabulary())
+        >>> (type(sl).__name__, sl.joinseqs())
+        ('InternedSeqList', ['a/*', 'b/*'])
+
+        """
+        if vocab is not None:
+            los = _skipcommon_flat(list(names), seplist, skip, vocab)
+            return InternedSeqList([array('i', s) for s in los], vocab)
+        if len(seplist) > 1:
+            return cls(_skipcommon_flat(list(names), seplist, skip))
+        return cls._skipcommon_recursive(names, seplist, skip)
+
     @classmethod
-    def skipcommon(cls, names, seplist, skip):
+    @_timed('skipcommon')
+    def _skipcommon_recursive(cls, names, seplist, skip, lol=None,
+                              chunks=None):
+        """
+        Recursive implementation of :meth:`skipcommon`
+
+        ``lol`` is ``names`` already split by ``seplist[0]`` and
+        ``chunks`` is its :func:`_get_chunks`, if given.
+
+        """
         if seplist:
-            (lol, sep) = _split_names(names, seplist[0])
-            chunks = _get_chunks(lol)
+            if lol is None:
+                (lol, sep, chunks) = _split_chunks(names, seplist[0])
+            else:
+                sep = seplist[0] or ''
+            if chunks is None:
+                chunks = _get_chunks(lol, None if sep else names)
             newlol = [_skip_common_parts_as_list(n, chunks, len(sep), skip)
                       for n in lol]
             if sep:
@@ -408,7 +2027,8 @@ class SeqList(object):
                 if subnames.homo() and subnames.nonnull() in (sep, skip):
                     subnews = [[n] for n in subnames]
                 else:
-                    subnews = cls.skipcommon(subnames, seplist[1:], skip)
+                    subnews = cls._skipcommon_recursive(
+                        subnames, seplist[1:], skip)
                 fullsl.extendseq(subnews, subnames.indices)
             return fullsl
         else:
@@ -425,9 +2045,15 @@ class SeqList(object):
         [2]
         >>> sl.col(2).indices
         [0]
+        >>> list(sl.col(3))
+        []
 
         """
-        return ColView(self._los, i)
+        if self._cols is None:
+            self._cols = _columns(self._los)
+        if i < len(self._cols):
+            return self._cols[i]
+        return _Column([], [])
 
     def extendseq(self, los, indices):
         """
@@ -442,6 +2068,7 @@ class SeqList(object):
         SeqList([[0, 1, 2, 2], [3, 4]])
 
         """
+        self._cols = None
         for (s, i) in zip(los, indices):
             self._los[i].extend(s)
 
@@ -458,7 +2085,7 @@ class SeqList(object):
         SeqList([[1, 2], [4, 5]])
 
         """
-        return self.__class__([s[start:stop] for s in self._los])
+        return self._new([s[start:stop] for s in self._los])
 
     def reverseseq(self):
         """
@@ -470,18 +2097,35 @@ class SeqList(object):
         SeqList([[2, 1, 0], [5, 4, 3]])
 
         """
-        self._los = [list(reversed(s)) for s in self._los]
+        self._los = [s[::-1] for s in self._los]
+        self._cols = None
+
+    def take(self, indices):
+        """
+        Get the sequences at ``indices``
+
+        >>> SeqList([[0], [1, 2], [3]]).take([2, 0])
+        SeqList([[3], [0]])
+
+        """
+        return self._new([self._los[i] for i in indices])
 
     def filled(self, fill):
         """
         Return a new SeqList instance whose sequences have same length
 
+        With NumPy and at least ``_NUMPY_MIN_ROWS`` sequences, it is an
+        :class:`_ArraySeqList` built without a Python loop over them.
+
         >>> SeqList([[0, 1, 2], [3, 4]]).filled(None)
         SeqList([[0, 1, 2], [3, 4, None]])
 
         """
+        if len(self) >= _NUMPY_MIN_ROWS and _numpy() is not None:
+            return _ArraySeqList(_fill_array(self._los, fill, object),
+                                 self._new([]))
         seqlen = self.maxseqlen()
-        return self.__class__(
+        return self._new(
             [s + [fill] * (seqlen - len(s)) for s in self._los])
 
     def maxseqlen(self):
@@ -503,8 +2147,186 @@ class SeqList(object):
         return [''.join(x for x in l if x is not none) for l in self._los]
 
 
+class InternedSeqList(SeqList):
+
+    """
+    SeqList whose tokens are interned into integer IDs
+
+    Each distinct token is stored once in a shared vocabulary and
+    sequences are ``array('i')`` of token IDs.  Comparisons and
+    hashing in :class:`ColView` and :func:`_diff_list` become integer
+    operations and strings are only built by the join methods.
+    Token ID 0 is reserved for None.
+
+    >>> sl = SeqList([['a', 'b', 'c'], ['a', 'x']]).interned()
+    >>> sl.filled(None).joinseqs_skipping_nones()
+    ['abc', 'ax']
+    >>> sub = sl.subseqlist(1, 3)
+    >>> sub.reverseseq()
+    >>> sub.joinseqs()
+    ['cb', 'x']
+    >>> sl.col(0).homo()
+    True
+
+    """
+
+    __slots__ = ('_vocab',)
+
+    def __init__(self, los, vocab):
+        SeqList.__init__(self, los)
+        self._vocab = vocab
+
+    def _new(self, los):
+        return self.__class__(los, self._vocab)
+
+    def tokenwidth(self, token):
+        return self._vocab.widths[token]
+
+    def extendseq(self, los, indices):
+        self._cols = None
+        for (s, i) in zip(los, indices):
+            self._los[i].extend(self._vocab.internseq(s))
+
+    def filled(self, fill):
+        fill = self._vocab.intern(fill)
+        if len(self) >= _NUMPY_MIN_ROWS and _numpy() is not None:
+            return _ArraySeqList(_fill_array(self._los, fill, numpy.intc),
+                                 self._new([]))
+        seqlen = self.maxseqlen()
+        return self._new(
+            [s + array('i', [fill]) * (seqlen - len(s)) for s in self._los])
+
+    def joinseqs(self):
+        tokens = self._vocab.tokens
+        return [''.join([tokens[t] for t in s]) for s in self._los]
+
+    def joinseqs_skipping_nones(self, none=None):
+        tokens = self._vocab.tokens
+        none = self._vocab.ids.get(none)
+        return [''.join([tokens[t] for t in s if t != none])
+                for s in self._los]
+
+
+class _ArraySeqList(SeqList):
+
+    """
+    SeqList of equal-length sequences held in a 2-D NumPy array
+
+    :meth:`subseqlist` and :meth:`reverseseq` make views instead of
+    new lists and :meth:`ColView.homo` is a vectorized comparison.
+    Joining is delegated to ``proto``, an (empty) SeqList of the kind
+    this was filled from, on the rows as lists; only then is the whole
+    array copied.  The sequences cannot be extended.
+
+    >>> sl = SeqList([['a', 'b'], ['c']] * 32).filled(None)
+    >>> sl.maxseqlen()
+    2
+    >>> sl.reverseseq()
+    >>> sl.col(0).homo()
+    False
+    >>> sl.subseqlist(1, 2).joinseqs_skipping_nones()[:2]
+    ['a', 'c']
+    >>> sl.extendseq([['d']], [0])
+    Traceback (most recent call last):
+      ...
+    TypeError: _ArraySeqList cannot be extended
+
+    """
+
+    __slots__ = ('_arr', '_proto')
+
+    def __init__(self, arr, proto):
+        self._arr = arr
+        self._proto = proto
+        self._cols = None
+
+    def __unicode__(self):
+        return u"{0}({1})".format(self.__class__.__name__, self._arr)
+
+    def __repr__(self):
+        return u"{0}({1!r})".format(self.__class__.__name__, self._arr)
+
+    def __len__(self):
+        return len(self._arr)
+
+    def __iter__(self):
+        return (row.tolist() for row in self._arr)
+
+    def _new(self, los):
+        return self._proto._new(los)
+
+    def tokenwidth(self, token):
+        return self._proto.tokenwidth(token)
+
+    def interned(self, vocab=None):
+        return self._new(self._arr.tolist()).interned(vocab)
+
+    def col(self, i):
+        return _ArrayColView(self._arr[:, i])
+
+    def extendseq(self, los, indices):
+        raise TypeError(
+            '{0} cannot be extended'.format(self.__class__.__name__))
+
+    def subseqlist(self, start, stop):
+        return self.__class__(self._arr[:, start:stop], self._proto)
+
+    def reverseseq(self):
+        self._arr = self._arr[:, ::-1]
+
+    def take(self, indices):
+        return self.__class__(self._arr[indices], self._proto)
+
+    def filled(self, fill):
+        # All the rows already have the same length.
+        return self
+
+    def maxseqlen(self):
+        return self._arr.shape[1]
+
+    def joinseqs(self):
+        return self._new(self._arr.tolist()).joinseqs()
+
+    def joinseqs_skipping_nones(self, none=None):
+        return self._new(self._arr.tolist()).joinseqs_skipping_nones(none)
+
+
+class _Vocabulary(object):
+
+    """
+    Mapping between tokens and integer IDs
+
+    >>> vocab = _Vocabulary()
+    >>> vocab.internseq(['a', 'b', 'a', None])
+    array('i', [1, 2, 1, 0])
+    >>> vocab.tokens
+    [None, 'a', 'b']
+    >>> vocab.widths
+    [0, 1, 1]
+
+    """
+
+    def __init__(self):
+        self.ids = {None: 0}
+        self.tokens = [None]
+        self.widths = [0]
+
+    def intern(self, token):
+        tid = self.ids.get(token)
+        if tid is None:
+            tid = self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+            self.widths.append(len(token))
+        return tid
+
+    def internseq(self, seq):
+        return array('i', map(self.intern, seq))
+
+
 class ColView(object):
 
+    __slots__ = ('_los', '_i', 'indices')
+
     def __init__(self, los, i):
         self._los = los
         self._i = i
@@ -529,6 +2351,1053 @@ class ColView(object):
         return self._los[self.indices[k]][self._i]
 
 
+def _columns(los):
+    """
+    Build the :class:`_Column` of each column of `los` in one pass
+
+    >>> [(c.values, c.indices) for c in _columns([[0, 1, 2], [3, 4]])]
+    [([0, 3], [0, 1]), ([1, 4], [0, 1]), ([2], [0])]
+
+    """
+    missing = object()
+    allrows = list(range(len(los)))
+    columns = []
+    for values in itertools.izip_longest(*los, fillvalue=missing):
+        if missing in values:
+            indices = [j for (j, v) in enumerate(values) if v is not missing]
+            values = [values[j] for j in indices]
+        else:
+            # Present in every row: share one list of all row indices
+            indices = allrows
+            values = list(values)
+        columns.append(_Column(values, indices))
+    return columns
+
+
+class _Column(ColView):
+
+    """
+    Column stored column-major: its values, the rows they are in and,
+    once asked for, the number of distinct values
+
+    >>> col = _Column(['a', 'b', 'a'], [0, 2, 3])
+    >>> (col[2], col.nonnull(1), col.ndistinct(), col.homo())
+    ('b', 'b', 2, False)
+    >>> col[1]
+    Traceback (most recent call last):
+      ...
+    IndexError: row 1 has no element in this column
+
+    """
+
+    __slots__ = ('values', '_ndistinct')
+
+    def __init__(self, values, indices):
+        self.values = values
+        self.indices = indices
+        self._ndistinct = None
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, j):
+        pos = bisect.bisect_left(self.indices, j)
+        if pos == len(self.indices) or self.indices[pos] != j:
+            raise IndexError(
+                'row {0} has no element in this column'.format(j))
+        return self.values[pos]
+
+    def ndistinct(self):
+        """Return the number of distinct values in this column"""
+        if self._ndistinct is None:
+            self._ndistinct = len(set(self.values))
+        return self._ndistinct
+
+    def homo(self):
+        return self.ndistinct() == 1
+
+    def nonnull(self, k=0):
+        return self.values[k]
+
+
+class _ArrayColView(ColView):
+
+    __slots__ = ('_col',)
+
+    def __init__(self, col):
+        self._col = col
+        self.indices = range(len(col))
+
+    def __iter__(self):
+        return iter(self._col.tolist())
+
+    def __getitem__(self, j):
+        return self._col[j]
+
+    def homo(self):
+        return bool((self._col == self._col[:1]).all())
+
+    def nonnull(self, k=0):
+        return self._col[k]
+
+
+def _lazy_names(render, num, lazy):
+    return LazyNames(render, num, maxsize=0 if lazy is True else lazy)
+
+
+class LazyNames(collections.Sequence):
+
+    """
+    Sequence of results which are built when indexed or iterated
+
+    Functions given ``lazy=True`` return it instead of a list.
+    ``render`` builds the results at a list of indices and ``num`` is
+    their number.  Results are built in blocks while iterating.  If
+    ``maxsize`` is positive, the last ``maxsize`` results built by
+    indexing are kept in an LRU cache, for views which are indexed
+    again and again (e.g., the visible rows of a scrolling list).
+
+    >>> view = LazyNames(lambda indices: [str(i) * 2 for i in indices], 3)
+    >>> (len(view), view[1], view[-1], view[:2])
+    (3, '11', '22', ['00', '11'])
+    >>> list(view.reindex([2, 2, 0]))
+    ['22', '22', '00']
+
+    """
+
+    _BLOCK = 1024
+
+    def __init__(self, render, num, maxsize=0):
+        self._render = render
+        self._num = num
+        self._index = None
+        self._cache = _LRUCache(maxsize) if maxsize > 0 else None
+
+    def __len__(self):
+        return self._num if self._index is None else len(self._index)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._build(range(*i.indices(len(self))))
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('LazyNames index out of range')
+        return self._build([i])[0]
+
+    def __iter__(self):
+        for start in range(0, len(self), self._BLOCK):
+            indices = range(start, min(start + self._BLOCK, len(self)))
+            if self._index is not None:
+                indices = [self._index[i] for i in indices]
+            for name in self._render(indices):
+                yield name
+
+    def __repr__(self):
+        return '<{0} of {1} names>'.format(self.__class__.__name__,
+                                           len(self))
+
+    def reindex(self, index):
+        """Return a view of the results at the positions in ``index``"""
+        if self._index is not None:
+            index = [self._index[i] for i in index]
+        view = self.__class__(self._render, self._num)
+        view._index = index
+        view._cache = self._cache
+        return view
+
+    def _build(self, positions):
+        if self._index is not None:
+            positions = [self._index[i] for i in positions]
+        if self._cache is None:
+            return self._render(positions)
+        names = [self._cache.get(i) for i in positions]
+        missing = [i for (i, name) in zip(positions, names) if name is None]
+        if not missing:
+            return names
+        built = dict(zip(missing, self._render(missing)))
+        for (i, name) in built.items():
+            self._cache.put(i, name)
+        return [built[i] if name is None else name
+                for (i, name) in zip(positions, names)]
+
+
+class Uniquifier(object):
+
+    """
+    Keep unique names of a changing list of strings
+
+    Short names are the same as what :func:`skipcommonname` returns
+    for the current names.  Each :meth:`add` and :meth:`remove`
+    returns a dict which maps names to their new short name (None for
+    removed name), but only for the names whose short name changed.
+
+    >>> uq = Uniquifier(sep='/', skip='*')
+    >>> uq.add('a/b/c')
+    {'a/b/c': '*'}
+    >>> sorted(uq.add('a/x/c').items())
+    [('a/b/c', '*/b/*'), ('a/x/c', '*/x/*')]
+    >>> uq.add('a/y/c')
+    {'a/y/c': '*/y/*'}
+    >>> uq.names()
+    ['a/b/c', 'a/x/c', 'a/y/c']
+    >>> uq['a/x/c']
+    '*/x/*'
+    >>> sorted(uq.remove('a/y/c').items())
+    [('a/y/c', None)]
+    >>> sorted(uq.remove('a/x/c').items())
+    [('a/b/c', '*'), ('a/x/c', None)]
+
+    The chunks of common and different parts are kept between calls.
+    As long as an update does not change them, only the names sharing
+    a token with the added or removed name in a part which is further
+    split (when ``sep`` is a tuple) are rendered again.
+
+    """
+
+    def __init__(self, names=(), sep=None, skip='...'):
+        if not isinstance(sep, (tuple, list)):
+            sep = (sep,)
+        self._level = _UniquifierLevel(tuple(sep), skip)
+        self._counts = {}
+        self._serial = 0
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return sum(self._counts.values())
+
+    def __contains__(self, name):
+        return name in self._counts
+
+    def __getitem__(self, name):
+        if name not in self._counts:
+            raise KeyError(name)
+        return self._level.short(name)
+
+    def add(self, name):
+        """Add ``name`` and return changed short names"""
+        if name in self._counts:
+            self._counts[name][0] += 1
+            return {}
+        self._counts[name] = [1, self._serial]
+        self._serial += 1
+        changed = self._level.add(name)
+        return dict((n, self._level.short(n)) for n in changed)
+
+    def remove(self, name):
+        """Remove one ``name`` and return changed short names"""
+        if name not in self._counts:
+            raise KeyError(name)
+        count = self._counts[name]
+        count[0] -= 1
+        if count[0] > 0:
+            return {}
+        del self._counts[name]
+        changed = self._level.remove(name)
+        newshort = dict((n, self._level.short(n)) for n in changed)
+        newshort[name] = None
+        return newshort
+
+    def names(self):
+        """Return the list of names in the order they are added"""
+        ordered = sorted(self._counts.items(), key=lambda x: x[1][1])
+        return [n for (n, (count, _)) in ordered for _i in range(count)]
+
+    def shortnames(self):
+        """Return the list of short names corresponding to :meth:`names`"""
+        return [self._level.short(n) for n in self.names()]
+
+
+class _UniquifierLevel(object):
+
+    """
+    Incremental version of one level of :meth:`SeqList.skipcommon`
+
+    It holds distinct ``values`` split by ``seplist[0]``.  Columns
+    which :meth:`SeqList.skipcommon` would split again by
+    ``seplist[1:]`` are handled by child levels, one per column.
+
+    """
+
+    def __init__(self, seplist, skip):
+        self._seplist = seplist
+        self._skip = skip
+        self._sep = ''
+        self._tokens = {}
+        self._cols = []
+        self._layout = ((), ())
+        self._children = {}
+        self._short = {}
+
+    def short(self, value):
+        return self._short[value]
+
+    def add(self, value):
+        """Add ``value`` and return a set of values to be re-rendered"""
+        if value in self._tokens:
+            return set()
+        return self._update(value, self._insert(value), True)
+
+    def _insert(self, value):
+        ([tokens], self._sep) = _split_names([value], self._seplist[0])
+        self._tokens[value] = tokens
+        for (i, tok) in enumerate(tokens):
+            if i == len(self._cols):
+                self._cols.append({})
+            self._cols[i].setdefault(tok, set()).add(value)
+        return tokens
+
+    def remove(self, value):
+        """Remove ``value`` and return a set of values to be re-rendered"""
+        tokens = self._tokens.pop(value)
+        del self._short[value]
+        for (i, tok) in enumerate(tokens):
+            col = self._cols[i]
+            col[tok].discard(value)
+            if not col[tok]:
+                del col[tok]
+        while self._cols and not self._cols[-1]:
+            self._cols.pop()
+        return self._update(value, tokens, False)
+
+    def _update(self, value, tokens, added):
+        layout = self._get_layout()
+        if layout != self._layout:
+            self._layout = layout
+            return self._rebuild()
+
+        affected = set()
+        for (i, tok) in enumerate(tokens):
+            child = self._children.get(i)
+            if child is None:
+                continue
+            if added:
+                childchanged = child.add(tok)
+            elif tok not in self._cols[i]:
+                childchanged = child.remove(tok)
+            else:
+                continue
+            for v in childchanged:
+                affected.update(self._cols[i].get(v, ()))
+        if added:
+            affected.add(value)
+        return self._render(affected)
+
+    def _get_layout(self):
+        """
+        Return ``(slots, passthrough)`` of the current values
+
+        ``slots`` is a list of the column index or None for skip mark
+        of each output column.  ``passthrough`` tells if each column
+        in ``slots`` is used as-is instead of split further.
+
+        """
+        numvalues = len(self._tokens)
+        rawdiffs = [len(col) != 1 or len(col.values()[0]) != numvalues
+                    for col in self._cols]
+        if not rawdiffs:
+            return ((), ())
+        sepwidth = len(self._sep)
+        skipwidth = len(self._skip)
+        slots = []
+        for ((start, stop), diff) in zip(*_chunks_from_diffs(rawdiffs)):
+            if not diff:
+                subwidth = sum(len(col.keys()[0])
+                               for col in self._cols[start:stop])
+                if subwidth + sepwidth * (stop - start) >= skipwidth:
+                    slots.append(None)
+                    continue
+            slots.extend(range(start, stop))
+        passthrough = [
+            i is None or
+            len(self._cols[i]) == 1 and
+            self._cols[i].keys()[0] in (self._sep, self._skip)
+            for i in slots]
+        return (tuple(slots), tuple(passthrough))
+
+    def _rebuild(self):
+        self._children = {}
+        if len(self._seplist) > 1:
+            for (i, passthrough) in zip(*self._layout):
+                if not passthrough:
+                    child = _UniquifierLevel(self._seplist[1:], self._skip)
+                    for tok in self._cols[i]:
+                        child._insert(tok)
+                    child._layout = child._get_layout()
+                    child._rebuild()
+                    self._children[i] = child
+        return self._render(self._tokens)
+
+    def _render(self, values):
+        changed = set()
+        for value in values:
+            tokens = self._tokens[value]
+            parts = []
+            for i in self._layout[0]:
+                if i is None:
+                    parts.append(self._skip)
+                elif i < len(tokens):
+                    child = self._children.get(i)
+                    if child is None:
+                        parts.append(tokens[i])
+                    else:
+                        parts.append(child.short(tokens[i]))
+            short = self._sep.join(parts)
+            if self._short.get(value) != short:
+                self._short[value] = short
+                changed.add(value)
+        return changed
+
+
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+def _hashable(value):
+    """Return a list (e.g., of separators) as a tuple for a cache key"""
+    return tuple(value) if isinstance(value, list) else value
+
+
+def memoize(func, maxsize=128):
+    """
+    Wrap one of the public functions with a LRU cache of its results
+
+    The cache is keyed on the ordered names (or the :class:`Analysis`
+    object) and the other arguments, where a list of separators counts
+    as a tuple of them.  At most ``maxsize`` results are kept and the
+    least recently used one is discarded first.  The wrapper has
+    ``cache_info()`` and ``cache_clear()`` methods.
+
+    Like the function, the wrapper accepts NumPy arrays and pandas
+    Series and returns a new list or container on each call, except
+    that :class:`LazyNames` are shared.
+
+    >>> cshortpath = memoize(shortpath, maxsize=2)
+    >>> cshortpath(['a/b/c', 'a/x/c'])
+    ['b', 'x']
+    >>> cshortpath(['a/b/c', 'a/x/c'])
+    ['b', 'x']
+    >>> cshortpath(['a/b/c', 'a/x/c'], utype='head')
+    ['b', 'x']
+    >>> cshortpath.cache_info()
+    CacheInfo(hits=1, misses=2, maxsize=2, currsize=2)
+    >>> cshortname = memoize(shortname)
+    >>> cshortname(['a/b_c', 'a/x_c'], ['/', '_'])
+    ['b', 'x']
+    >>> cshortname(['a/b_c', 'a/x_c'], sep=('/', '_'))
+    ['b', 'x']
+    >>> cshortpath.cache_clear()
+    >>> cshortpath.cache_info()
+    CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
+    """
+    cache = _LRUCache(maxsize)
+    counts = [0, 0]  # hits, misses
+
+    @_same_container
+    @functools.wraps(func)
+    def new_func(names, *args, **kwds):
+        if not isinstance(names, Analysis):
+            names = [_as_bytes(n) if isinstance(n, _BUFFER_TYPES) else n
+                     for n in names]
+        key = (names if isinstance(names, Analysis) else tuple(names),
+               tuple(map(_hashable, args)),
+               tuple(sorted((k, _hashable(v)) for (k, v) in kwds.items())))
+        result = cache.get(key)
+        if result is None:
+            counts[1] += 1
+            result = func(names, *args, **kwds)
+            cache.put(key, result)
+        else:
+            counts[0] += 1
+        if isinstance(result, LazyNames):
+            return result
+        return list(result)
+
+    def cache_info():
+        return CacheInfo(counts[0], counts[1], maxsize, len(cache))
+
+    def cache_clear():
+        cache.clear()
+        counts[:] = [0, 0]
+
+    new_func.cache_info = cache_info
+    new_func.cache_clear = cache_clear
+    return new_func
+
+
+class _LRUCache(object):
+
+    """
+    Mapping which keeps at most ``maxsize`` recently used items
+
+    >>> cache = _LRUCache(2)
+    >>> cache.put('a', 1)
+    >>> cache.put('b', 2)
+    >>> cache.get('a')
+    1
+    >>> cache.put('c', 3)
+    >>> (cache.get('a'), cache.get('b'), cache.get('c'))
+    (1, None, 3)
+
+    """
+
+    def __init__(self, maxsize):
+        self._maxsize = maxsize
+        self._links = {}
+        # Circular doubly linked list of [prev, next, key, value].
+        # root[1] is the least recently used link.
+        self._root = root = []
+        root[:] = [root, root, None, None]
+
+    def __len__(self):
+        return len(self._links)
+
+    def get(self, key, default=None):
+        link = self._links.get(key)
+        if link is None:
+            return default
+        self._unlink(link)
+        self._append(link)
+        return link[3]
+
+    def put(self, key, value):
+        link = self._links.pop(key, None)
+        if link is not None:
+            self._unlink(link)
+        if self._maxsize <= 0:
+            return
+        if len(self._links) >= self._maxsize:
+            oldest = self._root[1]
+            self._unlink(oldest)
+            del self._links[oldest[2]]
+        link = [None, None, key, value]
+        self._append(link)
+        self._links[key] = link
+
+    def clear(self):
+        self._links.clear()
+        self._root[:] = [self._root, self._root, None, None]
+
+    def _unlink(self, link):
+        (prev, next_) = link[:2]
+        prev[1] = next_
+        next_[0] = prev
+
+    def _append(self, link):
+        root = self._root
+        last = root[0]
+        link[0] = last
+        link[1] = root
+        last[1] = root[0] = link
+
+
+_METHODS = ('shortpath', 'shortname', 'skipcommonname', 'skipcommonpath')
+
+
+def batch(groups, method='skipcommonpath', workers=None, chunksize=1000,
+          **kwds):
+    """
+    Call ``method`` for each list of names in ``groups``
+
+    Groups are processed in a pool of ``workers`` processes (default:
+    the number of CPUs).  Consecutive small groups are sent together
+    until they have ``chunksize`` names in total and a group larger
+    than that is sent alone.  Results are in the order of ``groups``.
+    ``workers=1`` runs everything in this process.  Other keyword
+    arguments are passed to ``method``.
+
+    >>> batch([['a/b/c/d', 'a/b/c/e'], ['x/1', 'y/1']], workers=1)
+    [['.../d', '.../e'], ['x/1', 'y/1']]
+    >>> batch([['a_b', 'a_c'], ['x_1', 'y_1']], 'shortname', workers=1,
+    ...       sep='_')
+    [['b', 'c'], ['x', 'y']]
+
+    """
+    if method not in _METHODS:
+        raise ValueError("'{0}' is not a recognized ``method``".format(method))
+    tasks = [(method, chunk, kwds)
+             for chunk in _chunk_groups(groups, chunksize)]
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_batch_worker, tasks)
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers)
+        try:
+            results = pool.map(_batch_worker, tasks, 1)
+        finally:
+            pool.close()
+            pool.join()
+    return [r for chunkresults in results for r in chunkresults]
+
+
+def _chunk_groups(groups, chunksize):
+    """
+    Pack consecutive ``groups`` into chunks of about ``chunksize`` names
+
+    >>> list(_chunk_groups([[1, 2], [3], [4, 5, 6, 7], [8]], 3))
+    [[[1, 2], [3]], [[4, 5, 6, 7]], [[8]]]
+
+    """
+    chunk = []
+    size = 0
+    for group in groups:
+        group = list(group)
+        if chunk and size + len(group) > chunksize:
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(group)
+        size += len(group)
+    if chunk:
+        yield chunk
+
+
+def _batch_worker(task):
+    (method, groups, kwds) = task
+    func = globals()[method]
+    return [func(names, **kwds) for names in groups]
+
+
+def _is_ascii(s):
+    try:
+        s.decode('ascii')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+class Index(object):
+
+    """
+    Short names of a fixed corpus, looked up one name at a time
+
+    The short name of each name depends on the whole corpus, so all of
+    them are computed once by ``method`` (called with ``kwds``) when
+    the index is built.  :meth:`short` is then a dictionary lookup.
+
+    >>> index = Index(['some/long/path/ABC/middle/part/DEF',
+    ...                'some/long/path/XYZ/middle/part/DEF',
+    ...                'some/long/path/XYZ/middle/part/UVW'])
+    >>> index.short('some/long/path/XYZ/middle/part/DEF')
+    'XYZ/.../DEF'
+    >>> 'some/other/path' in index
+    False
+
+    An index can be saved to a file and loaded back:
+
+    >>> import os, tempfile
+    >>> (fd, path) = tempfile.mkstemp()
+    >>> index.save(path)
+    >>> Index.load(path).short('some/long/path/XYZ/middle/part/DEF')
+    'XYZ/.../DEF'
+    >>> os.close(fd)
+    >>> os.remove(path)
+
+    The file is a JSON header line followed by the names and their
+    short names separated by NUL and compressed by zlib, so an index
+    of names containing NUL cannot be saved.
+
+    """
+
+    _MAGIC = 'uniquify-index 1\n'
+
+    def __init__(self, names=(), method='shortpath', **kwds):
+        if method not in _METHODS:
+            raise ValueError("'{0}' is not a recognized method".format(method))
+        self.method = method
+        self.options = kwds
+        names = _dedupe(names)[0]
+        self._short = dict(zip(names, globals()[method](names, **kwds)))
+
+    def __len__(self):
+        return len(self._short)
+
+    def __contains__(self, name):
+        return name in self._short
+
+    def short(self, name):
+        """Return the short name of ``name``; KeyError if not indexed"""
+        return self._short[name]
+
+    def save(self, path):
+        r"""
+        Write the index to the file ``path``
+
+        ValueError is raised, and nothing written, if a name or short
+        name contains NUL, or if unicode names are mixed with byte
+        strings which are not ASCII (and so would not load back as the
+        same names).
+
+        >>> Index(['a\0b/x']).save(os.devnull)
+        Traceback (most recent call last):
+          ...
+        ValueError: name 'a\x00b/x' contains NUL
+        >>> Index([u'a/\xe9', 'b/\xc3']).save(os.devnull)
+        Traceback (most recent call last):
+          ...
+        ValueError: byte string 'b/\xc3' among unicode names is not ASCII
+
+        """
+        items = self._short.items()
+        for item in items:
+            for s in item:
+                if '\0' in s:
+                    raise ValueError('name {0!r} contains NUL'.format(s))
+        encoding = None
+        if any(isinstance(s, unicode) for item in items for s in item):
+            encoding = 'utf-8'
+            for item in items:
+                for s in item:
+                    if isinstance(s, bytes) and not _is_ascii(s):
+                        raise ValueError(
+                            'byte string {0!r} among unicode names is not '
+                            'ASCII'.format(s))
+        header = dict(method=self.method, options=self.options,
+                      encoding=encoding, count=len(items))
+        payload = '\0'.join(itertools.chain.from_iterable(items))
+        if encoding:
+            payload = payload.encode(encoding)
+        with open(path, 'wb') as f:
+            f.write(self._MAGIC)
+            f.write(json.dumps(header) + '\n')
+            f.write(zlib.compress(payload))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            if f.readline() != cls._MAGIC:
+                raise ValueError("'{0}' is not an index file".format(path))
+            header = json.loads(f.readline())
+            payload = zlib.decompress(f.read())
+        if header['encoding']:
+            payload = payload.decode(header['encoding'])
+        fields = payload.split('\0') if header['count'] else []
+        self = cls.__new__(cls)
+        self.method = header['method']
+        self.options = header['options']
+        self._short = dict(zip(fields[::2], fields[1::2]))
+        return self
+
+
+def _iter_groups(lines):
+    """
+    Split ``lines`` into groups separated by blank lines
+
+    >>> list(_iter_groups(['a', 'b', '', 'c', '', '', 'd']))
+    [['a', 'b'], ['c'], ['d']]
+
+    """
+    group = []
+    for line in lines:
+        if line:
+            group.append(line)
+        elif group:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+_WALK_METHODS = ('shortpath', 'skipcommonpath')
+
+_STREAM_METHODS = ('skipcommonname', 'skipcommonpath')
+
+
+def walk(root, method='skipcommonpath', workers=None, **kwds):
+    """
+    Walk the directory tree ``root`` and yield ``(path, short)`` pairs
+
+    ``short`` is the result of ``method`` ("shortpath" or
+    "skipcommonpath", called with ``kwds``) for the list of all files
+    found, but the paths are never re-split: each one is built from the
+    components of its directory, which are shared with its siblings.
+    Symbolic links are listed but not followed.  Directories are
+    scanned level by level, by ``workers`` threads if it is more than
+    one, which helps on network filesystems.
+
+    >>> import tempfile, shutil
+    >>> root = tempfile.mkdtemp()
+    >>> for d in ['a/x', 'b/x', 'b/y']:
+    ...     os.makedirs(os.path.join(root, d, 'src'))
+    ...     open(os.path.join(root, d, 'src', 'main.c'), 'w').close()
+    >>> [short for (path, short) in walk(root, 'shortpath')]
+    ['a/x', 'b/x', 'b/y']
+    >>> [path[len(root):] for (path, short) in walk(root)]
+    ['/a/x/src/main.c', '/b/x/src/main.c', '/b/y/src/main.c']
+    >>> shutil.rmtree(root)
+
+    The arguments are checked when it is called, before the walk:
+
+    >>> walk(root, 'bogus')
+    Traceback (most recent call last):
+      ...
+    ValueError: 'bogus' is not a recognized method
+
+    """
+    if method not in _WALK_METHODS:
+        raise ValueError("'{0}' is not a recognized method".format(method))
+    skip = kwds.pop('skip', '...')
+    options = adaptive = None
+    if method == 'shortpath':
+        options = (kwds.pop('utype', 'tail'), kwds.pop('minlen', 1),
+                   kwds.pop('engine', 'trie'), kwds.pop('compact', False))
+        adaptive = kwds.pop('adaptive', False)
+        _check_shortname_options(options[0], options[2])
+    if kwds:
+        raise TypeError("walk() got unexpected keyword arguments: {0}"
+                        .format(', '.join(sorted(kwds))))
+    return _walk(root, method, workers, skip, options, adaptive)
+
+
+def _walk(root, method, workers, skip, options, adaptive):
+    """Generator of :func:`walk` with its arguments already checked"""
+    sep = os.path.sep
+    rows = _walk_rows(root, workers)
+    if not rows:
+        return
+    paths = [sep.join(row) for row in rows]
+    sl = SeqList._skipcommon_recursive(paths, (sep,), skip, lol=rows)
+    if method == 'shortpath' and adaptive:
+        shorts = _shortname_adaptive(sl, options[0], options[1], (sep,))
+    elif method == 'shortpath':
+        shorts = _shortname_seqlist(sl, paths, *options)
+    else:
+        shorts = sl.joinseqs()
+    for pair in itertools.izip(paths, shorts):
+        yield pair
+
+
+def _walk_rows(root, workers=None):
+    """
+    Components of the paths of the files under ``root``
+
+    Each list is the components of the directory followed by the file
+    name; the directory components are split only once, from ``root``.
+
+    """
+    sep = os.path.sep
+    level = [(root, root.rstrip(sep).split(sep))]
+    rows = []
+    pool = None
+    if workers is not None and workers > 1:
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(workers)
+    try:
+        while level:
+            dirpaths = [dirpath for (dirpath, _) in level]
+            if pool is None:
+                scans = map(_scan_dir, dirpaths)
+            else:
+                scans = pool.map(_scan_dir, dirpaths)
+            nextlevel = []
+            for ((_, prefix), (files, dirs)) in zip(level, scans):
+                rows.extend(prefix + [name] for name in files)
+                for name in dirs:
+                    subprefix = prefix + [name]
+                    nextlevel.append((sep.join(subprefix), subprefix))
+            level = nextlevel
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return rows
+
+
+def _scan_dir(path):
+    """
+    Return sorted names of ``(files, directories)`` in directory ``path``
+
+    Unreadable directories are treated as empty, as in :func:`os.walk`.
+
+    """
+    files = []
+    dirs = []
+    try:
+        if scandir is not None:
+            for entry in scandir(path):
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                else:
+                    files.append(entry.name)
+        else:
+            for name in os.listdir(path):
+                mode = os.lstat(os.path.join(path, name)).st_mode
+                if stat.S_ISDIR(mode):
+                    dirs.append(name)
+                else:
+                    files.append(name)
+    except OSError:
+        pass
+    files.sort()
+    dirs.sort()
+    return (files, dirs)
+
+
+_REQUEST_OPTIONS = ('sep', 'skip', 'utype', 'minlen', 'engine', 'compact',
+                    'adaptive')
+
+
+def _answer(line):
+    """
+    Answer a JSON request ``line`` and return a JSON reply line
+
+    A request is an object with ``method``, ``names`` and, optionally,
+    ``options`` (keyword arguments for the method) and ``id`` which is
+    copied to the reply.  A reply has ``result`` or ``error``.
+
+    >>> print(_answer('{"method": "shortpath", "names": ["a/b", "c/b"]}'))
+    {"result": ["a", "c"]}
+    <BLANKLINE>
+    >>> print(_answer('{"method": "eval", "names": [], "id": 1}'))
+    {"error": "'eval' is not a recognized method", "id": 1}
+    <BLANKLINE>
+
+    """
+    reply = {}
+    try:
+        request = json.loads(line)
+        if 'id' in request:
+            reply['id'] = request['id']
+        method = request['method']
+        if method not in _METHODS:
+            raise ValueError("'{0}' is not a recognized method".format(method))
+        kwds = {}
+        for (key, value) in request.get('options', {}).items():
+            if key not in _REQUEST_OPTIONS:
+                raise ValueError(
+                    "'{0}' is not a recognized option".format(key))
+            kwds[str(key)] = value
+        reply['result'] = globals()[method](request['names'], **kwds)
+    except Exception as err:
+        reply['error'] = str(err)
+    return json.dumps(reply, sort_keys=True) + '\n'
+
+
+def _serve_lines(infile, outfile):
+    """Answer JSON requests in ``infile``, one per line"""
+    for line in iter(infile.readline, ''):
+        if line.strip():
+            outfile.write(_answer(line))
+            outfile.flush()
+
+
+def serve(path):
+    """
+    Answer JSON requests on the Unix domain socket ``path``
+
+    See :func:`_answer` for the protocol.  Each client is handled in
+    its own thread and can send any number of requests, one per line.
+    ``path="-"`` means to answer requests from stdin to stdout.
+
+    """
+    if path == '-':
+        _serve_lines(sys.stdin, sys.stdout)
+        return
+    import SocketServer
+
+    class Handler(SocketServer.StreamRequestHandler):
+        def handle(self):
+            _serve_lines(self.rfile, self.wfile)
+
+    class Server(SocketServer.ThreadingMixIn,
+                 SocketServer.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+        os.remove(path)  # left by a server which was killed
+    server = Server(path, Handler)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.remove(path)
+
+
+def _iter_lines(path):
+    """
+    Iterate over lines in file ``path`` ("-" means stdin)
+
+    Regular files are memory-mapped and other files (stdin, pipes) are
+    read in chunks by the file iterator.  In both cases the file is
+    never held as a list of lines.
+
+    """
+    if path == '-':
+        for line in sys.stdin:
+            yield line
+        return
+    with open(path, 'rb') as infile:
+        try:
+            mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            # empty file or file which cannot be mapped
+            for line in infile:
+                yield line
+            return
+        try:
+            for line in iter(mm.readline, ''):
+                yield line
+        finally:
+            mm.close()
+
+
+def _iter_records(path, delim):
+    """
+    Iterate over ``delim``-terminated records in file ``path``
+
+    Unlike :func:`_iter_lines`, records do not include the delimiter.
+
+    """
+    if path == '-':
+        for record in _split_stream(sys.stdin, delim):
+            yield record
+        return
+    with open(path, 'rb') as infile:
+        try:
+            mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            # empty file or file which cannot be mapped
+            for record in _split_stream(infile, delim):
+                yield record
+            return
+        try:
+            start = 0
+            while start < len(mm):
+                end = mm.find(delim, start)
+                if end < 0:
+                    end = len(mm)
+                yield mm[start:end]
+                start = end + 1
+        finally:
+            mm.close()
+
+
+def _split_stream(stream, delim, size=1 << 16):
+    """
+    Split ``stream`` at ``delim`` while reading it in chunks
+
+    >>> from StringIO import StringIO
+    >>> list(_split_stream(StringIO('a\\0b\\0\\0c'), '\\0', size=3))
+    ['a', 'b', '', 'c']
+
+    """
+    rest = ''
+    for chunk in iter(lambda: stream.read(size), ''):
+        records = (rest + chunk).split(delim)
+        rest = records.pop()
+        for record in records:
+            yield record
+    if rest:
+        yield rest
+
+
+def _write_lines(lines, stream, end='\n'):
+    """Write each of ``lines`` to ``stream`` without joining them first"""
+    stream.writelines(line + end for line in lines)
+    stream.flush()
+
+
 def main():
     from argparse import ArgumentParser
     parser = ArgumentParser(description='Uniquify CLI')
@@ -537,24 +3406,129 @@ def main():
         help='file to read. "-" means stdin. (default: %(default)s)')
     parser.add_argument(
         '-m', '--method', default='skipcommonpath',
-        choices=['shortpath', 'shortname', 'skipcommonname', 'skipcommonpath'],
+        choices=_METHODS,
         help='function to call (default: %(default)s)')
     parser.add_argument('-s', '--sep')
     parser.add_argument('-u', '--utype')
     parser.add_argument('-l', '--minlen', type=int)
+    parser.add_argument('-e', '--engine', choices=sorted(_SHORTNAME_ENGINES))
+    parser.add_argument('-c', '--compact', action='store_true',
+                        help='intern tokens into integer IDs')
+    parser.add_argument(
+        '-a', '--adaptive', action='store_true',
+        help='give each name its own shortest unique part instead of '
+        'one window shared by all names')
+    parser.add_argument(
+        '-0', '--null', action='store_true',
+        help='names in input and output are terminated by NUL instead of '
+        'newline and are not stripped (cf. find -print0, xargs -0)')
+    parser.add_argument(
+        '-g', '--groups', action='store_true',
+        help='uniquify each group of lines separated by a blank line '
+        'independently.  Output groups are separated by a blank line.')
+    parser.add_argument(
+        '-w', '--walk', action='store_true',
+        help='FILE is a directory.  Uniquify the paths of the files under '
+        'it and print each path and its result separated by a tab.  '
+        'Method must be shortpath or skipcommonpath.')
+    parser.add_argument(
+        '--stream', action='store_true',
+        help='read FILE once per separator and once more to print the '
+        'results, instead of holding all names in memory.  Method must be '
+        'skipcommonname or skipcommonpath.')
+    parser.add_argument(
+        '-j', '--workers', type=int,
+        help='number of processes used with --groups, threads used with '
+        '--walk or processes sharing a long list otherwise (default: '
+        'number of CPUs with --groups, 1 otherwise)')
+    parser.add_argument(
+        '--serve', metavar='SOCKET',
+        help='run as a server answering JSON requests, one per line, on '
+        'the Unix domain socket SOCKET.  "-" means stdin and stdout.')
+    parser.add_argument(
+        '--connect', metavar='SOCKET',
+        help='ask the server at SOCKET instead of computing here.  Only '
+        'FILE and --method, --sep, --utype, --minlen, --engine, '
+        '--compact, --adaptive and --null can be given with it.')
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='print time spent in each phase to stderr')
+    parser.add_argument(
+        '--cprofile', action='store_true',
+        help='print cProfile statistics to stderr')
     args = parser.parse_args()
 
-    kwds = dict((k, getattr(args, k)) for k in ['sep', 'utype', 'minlen']
+    kwds = dict((k, getattr(args, k))
+                for k in ['sep', 'utype', 'minlen', 'engine', 'compact',
+                          'adaptive']
                 if getattr(args, k))
 
-    if args.file == '-':
-        import sys
-        infile = sys.stdin
+    if args.walk and (args.method not in _WALK_METHODS or args.sep):
+        parser.error('--walk requires --method={0} and no --sep'.format(
+            ' or '.join(_WALK_METHODS)))
+    if args.stream and (args.method not in _STREAM_METHODS or
+                        args.file == '-' or args.groups or args.walk or
+                        args.connect):
+        parser.error('--stream requires --method={0}, a FILE other than '
+                     '"-" and no --groups, --walk or --connect'.format(
+                         ' or '.join(_STREAM_METHODS)))
+    if args.connect:
+        sys.exit(_connect())
+    if args.serve:
+        # exit via SystemExit so that serve() removes the socket
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        serve(args.serve)
+        return
+    if args.profile or args.cprofile:
+        # worker processes are not profiled
+        args.workers = 1
+    if args.cprofile:
+        import cProfile
+        import pstats
+        prof = cProfile.Profile()
+        prof.runcall(_run, args, kwds)
+        pstats.Stats(prof, stream=sys.stderr).sort_stats(
+            'cumulative').print_stats(30)
+    elif args.profile:
+        with profile() as stats:
+            _run(args, kwds)
+        sys.stderr.write(stats.report() + '\n')
     else:
-        infile = file(args.file)
-    lines = map(str.strip, infile.readlines())
-
-    print '\n'.join(globals()[args.method](lines, **kwds))
+        _run(args, kwds)
+
+
+def _run(args, kwds):
+    if args.walk:
+        end = '\0' if args.null else '\n'
+        _write_lines(('\t'.join(pair) for pair in
+                      walk(args.file, args.method, args.workers, **kwds)),
+                     sys.stdout, end)
+        return
+    if args.stream:
+        end = '\0' if args.null else '\n'
+        source = args.file
+        if args.null:
+            source = lambda: _iter_records(args.file, end)
+        func = globals()['i' + args.method]
+        _write_lines(func(source, **kwds), sys.stdout, end)
+        return
+    if args.null:
+        end = '\0'
+        lines = list(_iter_records(args.file, end))
+    else:
+        end = '\n'
+        lines = [line.strip() for line in _iter_lines(args.file)]
+    if args.groups:
+        results = batch(_iter_groups(lines), args.method, args.workers,
+                        **kwds)
+        for (i, group) in enumerate(results):
+            if i > 0:
+                sys.stdout.write(end)
+            _write_lines(group, sys.stdout, end)
+    else:
+        if args.workers:
+            kwds = dict(kwds, workers=args.workers)
+        _write_lines(globals()[args.method](lines, **kwds), sys.stdout, end)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,169 @@
+"""
+Thin client of a server started by ``uniquify.py --serve``
+
+Only :mod:`socket` and :mod:`json` are imported, so that a call costs
+one round trip to the server rather than loading :mod:`uniquify`.
+``uniquify.py --connect SOCKET ...`` is handed to :func:`main` before
+:mod:`uniquify` imports anything else.
+
+Names are read as bytes, which need not be UTF-8 (e.g., from ``find
+-print0``).  :func:`main` sends them decoded as latin-1, so that each
+byte is one character, and encodes the results back the same way.
+The server thus sees the names as ``uniquify.py`` would see them
+without ``--connect``.
+
+"""
+
+import sys
+import json
+
+
+_VALUES = {
+    '-m': 'method', '--method': 'method',
+    '-s': 'sep', '--sep': 'sep',
+    '-u': 'utype', '--utype': 'utype',
+    '-l': 'minlen', '--minlen': 'minlen',
+    '-e': 'engine', '--engine': 'engine',
+    '--connect': 'connect',
+}
+"""Options of ``uniquify.py`` taking a value which the client supports"""
+
+_FLAGS = {
+    '-c': 'compact', '--compact': 'compact',
+    '-a': 'adaptive', '--adaptive': 'adaptive',
+    '-0': 'null', '--null': 'null',
+}
+"""Options of ``uniquify.py`` without a value which the client supports"""
+
+
+def request(path, method, names, **kwds):
+    """
+    Call ``method`` on a server started by :func:`uniquify.serve` at
+    ``path``
+
+    Raises ValueError when the server replies with an error.
+
+    """
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        stream = sock.makefile('rwb')
+        stream.write(json.dumps(dict(method=method, names=list(names),
+                                     options=kwds)) + '\n')
+        stream.flush()
+        reply = json.loads(stream.readline())
+        stream.close()
+    finally:
+        sock.close()
+    if 'error' in reply:
+        raise ValueError(reply['error'])
+    return reply['result']
+
+
+def parse_args(argv):
+    """
+    Parse the command line options of ``uniquify.py`` for the client
+
+    Returns ``(args, kwds)`` where ``kwds`` are the options passed to
+    the method.  Options which only make sense when computing here are
+    a ValueError.
+
+    >>> (args, kwds) = parse_args(['--connect', 'sock', '-0', '-l', '2',
+    ...                            '--method=shortpath', 'names.txt'])
+    >>> sorted(args.items())  # doctest: +NORMALIZE_WHITESPACE
+    [('connect', 'sock'), ('file', 'names.txt'), ('method', 'shortpath'),
+     ('null', True)]
+    >>> kwds
+    {'minlen': 2}
+    >>> parse_args(['--connect', 'sock', '--groups'])
+    Traceback (most recent call last):
+      ...
+    ValueError: --groups is not supported with --connect
+
+    """
+    args = dict(file='-', method='skipcommonpath', null=False)
+    kwds = {}
+    argv = list(argv)
+    files = []
+    while argv:
+        arg = argv.pop(0)
+        (name, eq, value) = arg.partition('=')
+        if arg in _FLAGS:
+            dest = _FLAGS[arg]
+            value = True
+        elif arg in _VALUES or (eq and name.startswith('--') and
+                                name in _VALUES):
+            dest = _VALUES[name]
+            if not eq:
+                if not argv:
+                    raise ValueError('{0} expects a value'.format(arg))
+                value = argv.pop(0)
+            if dest == 'minlen':
+                try:
+                    value = int(value)
+                except ValueError:
+                    raise ValueError(
+                        "invalid value for {0}: '{1}'".format(name, value))
+        elif arg == '-' or not arg.startswith('-'):
+            files.append(arg)
+            continue
+        else:
+            raise ValueError('{0} is not supported with --connect'.format(
+                name))
+        if dest in args or dest == 'connect':
+            args[dest] = value
+        else:
+            kwds[dest] = value
+    if len(files) > 1:
+        raise ValueError('only one FILE can be given')
+    if files:
+        args['file'] = files[0]
+    if 'connect' not in args:
+        raise ValueError('--connect is required')
+    return (args, kwds)
+
+
+def _read_records(path, end):
+    """
+    Read ``end``-terminated records of the file ``path`` ("-": stdin)
+    """
+    if path == '-':
+        data = sys.stdin.read()
+    else:
+        with open(path, 'rb') as infile:
+            data = infile.read()
+    records = data.split(end)
+    if records[-1] == '':
+        records.pop()
+    return records
+
+
+def main(argv=None):
+    """
+    Run ``uniquify.py --connect`` with ``argv`` (default: sys.argv)
+    """
+    try:
+        (args, kwds) = parse_args(sys.argv[1:] if argv is None else argv)
+    except ValueError as err:
+        sys.stderr.write('uniquify.py: error: {0}\n'.format(err))
+        return 2
+    end = '\0' if args['null'] else '\n'
+    names = _read_records(args['file'], end)
+    if not args['null']:
+        names = [name.strip() for name in names]
+    names = [name.decode('latin-1') for name in names]
+    if 'sep' in kwds:
+        kwds['sep'] = kwds['sep'].decode('latin-1')
+    try:
+        results = request(args['connect'], args['method'], names, **kwds)
+    except ValueError as err:
+        sys.stderr.write('uniquify.py: error: {0}\n'.format(err))
+        return 1
+    sys.stdout.writelines(r.encode('latin-1') + end for r in results)
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())